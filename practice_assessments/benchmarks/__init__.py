@@ -0,0 +1,5 @@
+"""Performance benchmarks for the practice problems.
+
+Run from the `practice_assessments/` directory, e.g.:
+    python -m benchmarks.file_storage_memory
+"""
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import importlib.util
+import os
+import subprocess
+import sys
+from types import ModuleType
+from typing import Optional
+
+
+PRACTICE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+
+def load_problem_module(problem_name: str, module_name: str = "simulation") -> ModuleType:
+    """Import `<problem_name>/<module_name>.py` under a unique name.
+
+    Every problem ships its own `simulation` module, so they cannot all be
+    imported by their plain names in one process. The problem directory is put
+    on `sys.path` (as the test runner does) so its sibling imports still work.
+    """
+    problem_dir = os.path.join(PRACTICE_ROOT, problem_name)
+    for path in (PRACTICE_ROOT, problem_dir):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    qualified_name = f"{problem_name}_{module_name}"
+    if qualified_name in sys.modules:
+        return sys.modules[qualified_name]
+    spec = importlib.util.spec_from_file_location(qualified_name, os.path.join(problem_dir, f"{module_name}.py"))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[qualified_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def git_revision() -> Optional[str]:
+    """Short hash of the checked-out commit, or None outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PRACTICE_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
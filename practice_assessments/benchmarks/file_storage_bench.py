@@ -0,0 +1,110 @@
+"""Time simulation.FileStorage against example.FileStorage on synthetic workloads.
+
+Usage (from practice_assessments/):
+    python -m benchmarks.file_storage_bench --scales 1000 100000 --json results.json
+    python -m benchmarks.file_storage_bench --scales 1000 100000 --compare results.json
+
+Commands are generated lazily and streamed through the simulator, so large scales need
+no memory for the command list; generation time is measured on its own and reported as
+`generator_seconds`, to be read as a floor for every row of that workload.
+The reference implementation deep-copies the whole store on every timed write, so it is
+skipped above --reference-max-ops.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import time
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional
+
+from benchmarks.common import git_revision, load_problem_module
+from benchmarks.file_storage_workloads import WORKLOADS
+from framework.simulator import make_streaming_simulator
+
+
+# module names under file_storage/
+IMPLEMENTATIONS = ("simulation", "example")
+
+
+def time_stream(stream: Any) -> float:
+    start = time.perf_counter()
+    # Drain without keeping outputs around
+    deque(stream, maxlen=0)
+    return time.perf_counter() - start
+
+
+def run(
+    workloads: List[str], scales: List[int], implementations: List[str], seed: int, reference_max_ops: int
+) -> Iterator[Dict[str, Any]]:
+    for workload in workloads:
+        generate = WORKLOADS[workload]
+        for ops in scales:
+            generator_seconds = time_stream(generate(ops, seed))
+            for implementation in implementations:
+                if implementation == "example" and ops > reference_max_ops:
+                    continue
+                storage_class = load_problem_module("file_storage", implementation).FileStorage
+                simulate = make_streaming_simulator(storage_class, compiled=True)
+                seconds = time_stream(simulate(generate(ops, seed)))
+                yield {
+                    "workload": workload,
+                    "ops": ops,
+                    "implementation": implementation,
+                    "seconds": seconds,
+                    "generator_seconds": generator_seconds,
+                    "ops_per_second": ops / seconds if seconds else 0.0,
+                }
+
+
+def format_row(result: Dict[str, Any], baseline: Optional[Dict[tuple, float]]) -> str:
+    line = (
+        f"{result['workload']:<15} {result['ops']:>9} {result['implementation']:<14}"
+        f" {result['seconds']:>9.3f} {result['ops_per_second']:>11.0f}"
+    )
+    if baseline is not None:
+        before = baseline.get((result["workload"], result["ops"], result["implementation"]))
+        line += f" {before / result['seconds']:>7.2f}x" if before else f" {'-':>8}"
+    return line
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark FileStorage implementations on synthetic workloads")
+    parser.add_argument("--workloads", nargs="+", choices=sorted(WORKLOADS), default=sorted(WORKLOADS))
+    parser.add_argument("--scales", nargs="+", type=int, default=[1000, 10000], help="Operation counts (1e3-1e7)")
+    parser.add_argument("--implementations", nargs="+", choices=IMPLEMENTATIONS, default=list(IMPLEMENTATIONS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--reference-max-ops", type=int, default=2000, help="Skip example.FileStorage above this scale")
+    parser.add_argument("--json", type=str, default=None, help="Write results to this JSON file")
+    parser.add_argument("--compare", type=str, default=None, help="Earlier results JSON to report speedups against")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as handle:
+            baseline = {(r["workload"], r["ops"], r["implementation"]): r["seconds"] for r in json.load(handle)["results"]}
+    header = f"{'workload':<15} {'ops':>9} {'implementation':<14} {'seconds':>9} {'ops/s':>11}"
+    print(header + (f" {'vs base':>8}" if baseline is not None else ""), flush=True)
+    results = []
+    for result in run(args.workloads, args.scales, args.implementations, args.seed, args.reference_max_ops):
+        results.append(result)
+        print(format_row(result, baseline), flush=True)
+    if args.json:
+        document = {
+            "meta": {
+                "revision": git_revision(),
+                "python": platform.python_version(),
+                "seed": args.seed,
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            },
+            "results": results,
+        }
+        with open(args.json, "w") as handle:
+            json.dump(document, handle, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
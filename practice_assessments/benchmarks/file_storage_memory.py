@@ -0,0 +1,100 @@
+"""Bytes-per-file comparison for FileStorage record layouts and snapshot strategies.
+
+Usage (from practice_assessments/):
+    python -m benchmarks.file_storage_memory --files 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List
+
+from benchmarks.common import load_problem_module
+
+
+@dataclass
+class DictFile:
+    """The original `File` layout: a plain dataclass with a per-instance __dict__."""
+
+    name: str
+    size: int
+    timestamp: int = 0
+    ttl: int | None = None
+
+
+def measure_bytes(build: Callable[[], Any]) -> int:
+    """Return the bytes still allocated by whatever `build` returns."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        kept = build()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del kept
+    return current
+
+
+def file_names(count: int) -> List[str]:
+    # Build names up front so both sides pay nothing for the strings themselves
+    return [f"dir-{i % 97}/file-{i}.txt" for i in range(count)]
+
+
+def run(count: int) -> Dict[str, Dict[str, float]]:
+    simulation = load_problem_module("file_storage", "simulation")
+    example = load_problem_module("file_storage", "example")
+    names = file_names(count)
+    t0 = 1625140800000
+
+    def records(file_class: type) -> Callable[[], list]:
+        return lambda: [file_class(name=name, size=i, timestamp=t0 + i, ttl=1000) for i, name in enumerate(names)]
+
+    def store(storage_class: type, timed: bool) -> Callable[[], Any]:
+        def build():
+            storage = storage_class()
+            for i, name in enumerate(names):
+                if timed:
+                    storage.file_upload_at(t0 + i, name, i, 1000)
+                else:
+                    storage.file_upload(name, i)
+            return storage
+        return build
+
+    cases = {
+        "record: dict dataclass": records(DictFile),
+        "record: slotted dataclass": records(simulation.File),
+        "store: example, untimed": store(example.FileStorage, timed=False),
+        "store: simulation, untimed": store(simulation.FileStorage, timed=False),
+        "store: example, timed (with snapshots)": store(example.FileStorage, timed=True),
+        "store: simulation, timed (with snapshots)": store(simulation.FileStorage, timed=True),
+    }
+    results = {}
+    for label, build in cases.items():
+        total = measure_bytes(build)
+        results[label] = {"files": count, "bytes": total, "bytes_per_file": total / count}
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure FileStorage memory per file")
+    parser.add_argument("--files", type=int, default=500, help="Number of files to upload (default: 500)")
+    parser.add_argument("--json", type=str, default=None, help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = run(args.files)
+    width = max(len(label) for label in results)
+    print(f"{'case':<{width}}  {'bytes/file':>12}")
+    for label, result in results.items():
+        print(f"{label:<{width}}  {result['bytes_per_file']:>12.1f}")
+    if args.json:
+        with open(args.json, "w") as handle:
+            json.dump(results, handle, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,118 @@
+"""Deterministic synthetic command streams for FileStorage.
+
+Every generator yields commands in the simulator's list form and only uses the API that
+both `simulation.FileStorage` and `example.FileStorage` implement. Streams are valid by
+construction: uploads use fresh names, and copies read from seed files that are uploaded
+first, never expire and survive every rollback, so no command raises.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Any, Callable, Dict, Iterator, List
+
+
+T0 = 1625140800000
+SEED_FILES = 16
+DIRECTORIES = 64
+
+
+class _Stream:
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+        self.clock = T0
+        self.uploaded = 0
+        self.seeds = [f"seed/{i}.bin" for i in range(SEED_FILES)]
+
+    def tick(self) -> int:
+        self.clock += self.rng.randrange(1, 5)
+        return self.clock
+
+    def prefix(self) -> str:
+        return f"dir-{self.rng.randrange(DIRECTORIES)}/"
+
+    def fresh_name(self) -> str:
+        self.uploaded += 1
+        return f"{self.prefix()}file-{self.uploaded}.dat"
+
+    def recent_name(self) -> str:
+        # Names recently uploaded are the likeliest hits for gets
+        number = max(1, self.uploaded - self.rng.randrange(64))
+        return f"dir-{self.rng.randrange(DIRECTORIES)}/file-{number}.dat"
+
+    def setup(self) -> Iterator[List[Any]]:
+        for name in self.seeds:
+            yield ["FILE_UPLOAD_AT", T0, name, self.rng.randrange(1, 1 << 20), None]
+
+    def upload(self, ttl: Any = None) -> List[Any]:
+        return ["FILE_UPLOAD_AT", self.tick(), self.fresh_name(), self.rng.randrange(1, 1 << 20), ttl]
+
+    def copy(self) -> List[Any]:
+        return ["FILE_COPY_AT", self.tick(), self.rng.choice(self.seeds), self.fresh_name()]
+
+    def get(self) -> List[Any]:
+        return ["FILE_GET_AT", self.tick(), self.recent_name()]
+
+    def search(self) -> List[Any]:
+        return ["FILE_SEARCH_AT", self.tick(), self.prefix()]
+
+
+def upload_heavy(ops: int, seed: int = 0) -> Iterator[List[Any]]:
+    stream = _Stream(seed)
+    yield from stream.setup()
+    for _ in range(ops):
+        roll = stream.rng.random()
+        if roll < 0.8:
+            yield stream.upload()
+        elif roll < 0.9:
+            yield stream.copy()
+        else:
+            yield stream.get()
+
+
+def search_heavy(ops: int, seed: int = 0) -> Iterator[List[Any]]:
+    stream = _Stream(seed)
+    yield from stream.setup()
+    for _ in range(ops):
+        roll = stream.rng.random()
+        if roll < 0.2:
+            yield stream.upload()
+        elif roll < 0.9:
+            yield stream.search()
+        else:
+            yield ["FILE_SEARCH", stream.prefix()]
+
+
+def ttl_churn(ops: int, seed: int = 0) -> Iterator[List[Any]]:
+    stream = _Stream(seed)
+    yield from stream.setup()
+    for _ in range(ops):
+        roll = stream.rng.random()
+        if roll < 0.5:
+            # Short lifetimes relative to the clock's pace, so most files die while the stream runs
+            yield stream.upload(ttl=stream.rng.randrange(10, 500))
+        elif roll < 0.75:
+            yield stream.get()
+        else:
+            yield stream.search()
+
+
+def rollback_heavy(ops: int, seed: int = 0) -> Iterator[List[Any]]:
+    stream = _Stream(seed)
+    yield from stream.setup()
+    for _ in range(ops):
+        roll = stream.rng.random()
+        if roll < 0.6:
+            yield stream.upload(ttl=stream.rng.choice([None, 1000]))
+        elif roll < 0.8:
+            yield stream.get()
+        else:
+            yield ["ROLLBACK", stream.rng.randrange(T0, stream.clock + 1)]
+
+
+WORKLOADS: Dict[str, Callable[..., Iterator[List[Any]]]] = {
+    "upload_heavy": upload_heavy,
+    "search_heavy": search_heavy,
+    "ttl_churn": ttl_churn,
+    "rollback_heavy": rollback_heavy,
+}
@@ -0,0 +1,83 @@
+"""Scaling of make_parallel_simulator over FileStorage sessions on 1/2/4/8 workers.
+
+Usage (from practice_assessments/):
+    python -m benchmarks.parallel_scaling --sessions 64 --commands 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+from benchmarks.common import PRACTICE_ROOT
+from framework.parallel_simulator import make_parallel_simulator
+
+
+def session_commands(seed: int, count: int) -> List[List[Any]]:
+    rng = random.Random(seed)
+    t0 = 1625140800000
+    commands = []
+    for i in range(count):
+        name = f"dir-{rng.randrange(20)}/file-{rng.randrange(count)}.txt"
+        roll = rng.random()
+        if roll < 0.4:
+            commands.append(["FILE_UPLOAD_AT", t0 + i, f"{name}.{i}", rng.randrange(1, 10_000), rng.choice([None, 5000])])
+        elif roll < 0.7:
+            commands.append(["FILE_GET_AT", t0 + i, name])
+        else:
+            commands.append(["FILE_SEARCH_AT", t0 + i, f"dir-{rng.randrange(20)}/"])
+    return commands
+
+
+def run(session_count: int, command_count: int, worker_counts: List[int]) -> Dict[str, Dict[str, float]]:
+    # Import under the module's real name, as the test runner does: worker processes
+    # unpickle the class by that name, which load_problem_module's alias would break
+    # under the spawn start method
+    problem_dir = os.path.join(PRACTICE_ROOT, "file_storage")
+    if problem_dir not in sys.path:
+        sys.path.insert(0, problem_dir)
+    from simulation import FileStorage as storage_class
+
+    sessions = [session_commands(seed, command_count) for seed in range(session_count)]
+    results = {}
+    baseline = None
+    for workers in worker_counts:
+        simulate = make_parallel_simulator(storage_class, workers=workers)
+        start = time.perf_counter()
+        simulate(sessions)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        results[str(workers)] = {
+            "seconds": elapsed,
+            "commands_per_second": session_count * command_count / elapsed,
+            "speedup": baseline / elapsed,
+        }
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure parallel simulator scaling")
+    parser.add_argument("--sessions", type=int, default=64, help="Independent sessions (default: 64)")
+    parser.add_argument("--commands", type=int, default=5000, help="Commands per session (default: 5000)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="Worker counts to try")
+    parser.add_argument("--json", type=str, default=None, help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = run(args.sessions, args.commands, args.workers)
+    print(f"cpu_count={os.cpu_count()}")
+    print(f"{'workers':>7}  {'seconds':>9}  {'commands/s':>12}  {'speedup':>7}")
+    for workers, result in results.items():
+        print(f"{workers:>7}  {result['seconds']:>9.3f}  {result['commands_per_second']:>12.0f}  {result['speedup']:>7.2f}")
+    if args.json:
+        with open(args.json, "w") as handle:
+            json.dump(results, handle, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
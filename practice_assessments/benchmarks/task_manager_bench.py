@@ -0,0 +1,185 @@
+"""Per-method throughput of task_manager.TaskManager on generated dependency graphs.
+
+Usage (from practice_assessments/):
+    python -m benchmarks.task_manager_bench --tasks 1000 10000 --json results.json
+    python -m benchmarks.task_manager_bench --tasks 1000 10000 --compare results.json
+    python -m benchmarks.task_manager_bench --graphs chain --tasks 1000000 --budget 60
+    python -m benchmarks.task_manager_bench --graphs fan_out --tasks 50000 200000 500000
+
+The last example checks that per-call cost does not grow with the board: update_task and
+delete_task rows should stay flat across the sizes.
+
+Each run builds a board (tasks, users, due dates, assignments, then the graph's edges),
+mutates it and queries it, timing every public method as its own phase. Arguments are
+generated before a phase starts, so rows time the calls alone. A phase stops early once
+it has run for --budget seconds; its throughput is then taken over the calls it finished
+and the row is marked truncated, which keeps superlinear methods from stalling large runs.
+Methods the implementation lacks are skipped, and a method that raises is reported with
+the error instead of aborting the run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import time
+from datetime import date, timedelta
+from itertools import islice
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from benchmarks.common import git_revision, load_problem_module
+from benchmarks.task_manager_graphs import GRAPHS
+
+
+Phase = Tuple[str, List[tuple]]
+
+
+def phases(module: ModuleType, graph: str, tasks: int, calls: int, seed: int) -> Iterator[Phase]:
+    """The (method name, argument tuples) of one benchmark run, in the order they execute."""
+    rng = random.Random(seed)
+    today = date.today()
+    priorities = list(module.TaskPriority)
+    statuses = list(module.TaskStatus)
+    users = max(1, tasks // 100)
+    projects = max(1, tasks // 10000)
+
+    def sample_ids() -> List[int]:
+        return [rng.randrange(1, tasks + 1) for _ in range(calls)]
+
+    yield "create_task_with_priority", [
+        (f"Task {task_id}", f"Generated task {task_id}", rng.choice(priorities)) for task_id in range(1, tasks + 1)
+    ]
+    yield "create_user", [(f"user-{user_id}", f"user-{user_id}@example.com") for user_id in range(1, users + 1)]
+    yield "set_due_date", [(task_id, today + timedelta(days=rng.randrange(-30, 90))) for task_id in range(1, tasks + 1)]
+    yield "assign_task", [(task_id, 1 + task_id % users) for task_id in range(1, tasks + 1)]
+    yield "create_project", [(f"project-{project_id}", "", 1) for project_id in range(1, projects + 1)]
+    yield "assign_task_to_project", [(task_id, 1 + task_id % projects) for task_id in range(1, tasks + 1)]
+    yield "add_dependency", list(GRAPHS[graph](tasks, seed))
+    # Finish the oldest quarter of the board so dependency queries see a mix of states
+    yield "update_task_status", [(task_id, module.TaskStatus.DONE) for task_id in range(1, tasks // 4 + 1)]
+    yield "update_task_priority", [(task_id, rng.choice(priorities)) for task_id in sample_ids()]
+
+    yield "get_task", [(task_id,) for task_id in sample_ids()]
+    yield "get_all_tasks", [()] * calls
+    yield "get_tasks_by_status", [(statuses[i % len(statuses)],) for i in range(calls)]
+    yield "get_tasks_by_priority", [(priorities[i % len(priorities)],) for i in range(calls)]
+    yield "get_available_tasks", [()] * calls
+    yield "get_blocked_tasks", [()] * calls
+    yield "get_user_tasks", [(1 + rng.randrange(users),) for _ in range(calls)]
+    yield "get_overdue_tasks", [()] * calls
+    yield "get_tasks_due_soon", [(rng.randrange(1, 30),) for _ in range(calls)]
+    yield "get_task_summary_by_user", [()] * calls
+    yield "get_project_tasks", [(1 + rng.randrange(projects),) for _ in range(calls)]
+    yield "get_project_progress", [(1 + rng.randrange(projects),) for _ in range(calls)]
+    yield "search_tasks", [(f"Task {rng.randrange(1, tasks + 1)}",) for _ in range(calls)]
+
+    yield "auto_update_blocked_status", [()] * calls
+    yield "update_overdue_status", [()] * calls
+    yield "bulk_assign_tasks", [(sample_ids()[:10], 1 + rng.randrange(users)) for _ in range(calls)]
+    yield "unassign_task", [(task_id,) for task_id in sample_ids()]
+    yield "update_task", [(task_id, f"Renamed task {task_id}", f"Edited task {task_id}") for task_id in sample_ids()]
+    yield "remove_dependency", list(islice(GRAPHS[graph](tasks, seed), calls))
+    yield "delete_task", [(task_id,) for task_id in sample_ids()]
+
+
+def time_calls(method: Callable[..., Any], calls: List[tuple], budget: float) -> Tuple[int, float, Optional[str]]:
+    """Call `method` with each argument tuple until done or out of budget.
+
+    Returns (calls finished, elapsed seconds, error message or None).
+    """
+    done = 0
+    error = None
+    start = time.perf_counter()
+    deadline = start + budget
+    try:
+        for args in calls:
+            method(*args)
+            done += 1
+            if time.perf_counter() > deadline:
+                break
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"
+    return done, time.perf_counter() - start, error
+
+
+def run(graphs: List[str], task_counts: List[int], calls: int, seed: int, budget: float) -> Iterator[Dict[str, Any]]:
+    module = load_problem_module("task_manager")
+    for graph in graphs:
+        for tasks in task_counts:
+            manager = module.TaskManager()
+            for method_name, arguments in phases(module, graph, tasks, calls, seed):
+                method = getattr(manager, method_name, None)
+                if method is None:
+                    continue
+                done, seconds, error = time_calls(method, arguments, budget)
+                yield {
+                    "graph": graph,
+                    "tasks": tasks,
+                    "method": method_name,
+                    "calls": done,
+                    "planned_calls": len(arguments),
+                    "seconds": seconds,
+                    "calls_per_second": done / seconds if seconds else 0.0,
+                    "truncated": error is None and done < len(arguments),
+                    "error": error,
+                }
+
+
+def format_row(result: Dict[str, Any], baseline: Optional[Dict[tuple, float]]) -> str:
+    line = (
+        f"{result['graph']:<13} {result['tasks']:>8} {result['method']:<27} {result['calls']:>8}"
+        f" {result['seconds']:>9.3f} {result['calls_per_second']:>11.0f}"
+    )
+    if baseline is not None:
+        before = baseline.get((result["graph"], result["tasks"], result["method"]))
+        line += f" {result['calls_per_second'] / before:>7.2f}x" if before else f" {'-':>8}"
+    if result["error"]:
+        line += f"  error: {result['error']}"
+    elif result["truncated"]:
+        line += f"  truncated ({result['planned_calls']} planned)"
+    return line
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark TaskManager methods on generated dependency graphs")
+    parser.add_argument("--graphs", nargs="+", choices=sorted(GRAPHS), default=sorted(GRAPHS))
+    parser.add_argument("--tasks", nargs="+", type=int, default=[1000, 10000], help="Board sizes (up to 1e6)")
+    parser.add_argument("--calls", type=int, default=100, help="Calls per query and sampled-update phase")
+    parser.add_argument("--budget", type=float, default=10.0, help="Seconds before a phase is cut short")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=str, default=None, help="Write results to this JSON file")
+    parser.add_argument("--compare", type=str, default=None, help="Earlier results JSON to report speedups against")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as handle:
+            baseline = {(r["graph"], r["tasks"], r["method"]): r["calls_per_second"] for r in json.load(handle)["results"]}
+    header = f"{'graph':<13} {'tasks':>8} {'method':<27} {'calls':>8} {'seconds':>9} {'calls/s':>11}"
+    print(header + (f" {'vs base':>8}" if baseline is not None else ""), flush=True)
+    results = []
+    for result in run(args.graphs, args.tasks, args.calls, args.seed, args.budget):
+        results.append(result)
+        print(format_row(result, baseline), flush=True)
+    if args.json:
+        document = {
+            "meta": {
+                "revision": git_revision(),
+                "python": platform.python_version(),
+                "seed": args.seed,
+                "calls": args.calls,
+                "budget": args.budget,
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            },
+            "results": results,
+        }
+        with open(args.json, "w") as handle:
+            json.dump(document, handle, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,72 @@
+"""Deterministic dependency-graph shapes for TaskManager.
+
+A shape is a lazy stream of `(task_id, depends_on_task_id)` edges over the ids 1..n that
+`create_task` hands out in order. Every shape is acyclic by construction, so
+`add_dependency` accepts each edge. In most shapes every edge points from a later task to
+an earlier one, which agrees with creation order. reverse_chain and shuffled_dag contradict
+it, so they exercise add_dependency's reordering.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Callable, Dict, Iterator, Tuple
+
+
+Edge = Tuple[int, int]
+
+
+def chain(tasks: int, seed: int = 0) -> Iterator[Edge]:
+    """One path through every task: the deepest possible graph."""
+    for task_id in range(2, tasks + 1):
+        yield task_id, task_id - 1
+
+
+def fan_out(tasks: int, seed: int = 0) -> Iterator[Edge]:
+    """A few hub tasks (one per thousand) that every other task depends on."""
+    hubs = max(1, tasks // 1000)
+    for task_id in range(hubs + 1, tasks + 1):
+        yield task_id, 1 + task_id % hubs
+
+
+def fan_in(tasks: int, seed: int = 0) -> Iterator[Edge]:
+    """A few sink tasks (one per thousand), each depending on a share of all the others."""
+    sinks = max(1, tasks // 1000)
+    first_sink = tasks - sinks + 1
+    for task_id in range(1, first_sink):
+        yield first_sink + task_id % sinks, task_id
+
+
+def random_dag(tasks: int, seed: int = 0, degree: int = 2) -> Iterator[Edge]:
+    """Each task depends on up to 2*degree distinct earlier tasks, `degree` on average."""
+    rng = random.Random(seed)
+    for task_id in range(2, tasks + 1):
+        count = min(task_id - 1, rng.randrange(2 * degree + 1))
+        for depends_on in rng.sample(range(1, task_id), count):
+            yield task_id, depends_on
+
+
+def reverse_chain(tasks: int, seed: int = 0) -> Iterator[Edge]:
+    """One path through every task, each depending on the next one created: every edge
+    contradicts creation order."""
+    for task_id in range(1, tasks):
+        yield task_id, task_id + 1
+
+
+def shuffled_dag(tasks: int, seed: int = 0, degree: int = 2) -> Iterator[Edge]:
+    """random_dag over the ids in a shuffled order, so about half the edges contradict
+    creation order."""
+    order = list(range(1, tasks + 1))
+    random.Random(seed).shuffle(order)
+    for task_id, depends_on in random_dag(tasks, seed, degree):
+        yield order[task_id - 1], order[depends_on - 1]
+
+
+GRAPHS: Dict[str, Callable[..., Iterator[Edge]]] = {
+    "chain": chain,
+    "fan_out": fan_out,
+    "fan_in": fan_in,
+    "random_dag": random_dag,
+    "reverse_chain": reverse_chain,
+    "shuffled_dag": shuffled_dag,
+}
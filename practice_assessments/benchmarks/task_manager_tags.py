@@ -0,0 +1,112 @@
+"""Multi-tag AND/OR queries on TaskManager's tag index against a per-task scan.
+
+Usage (from practice_assessments/):
+    python -m benchmarks.task_manager_tags --tasks 1000000 --tags 1000
+
+Tags are drawn from a Zipf-like distribution over the vocabulary, so queries mix popular
+tags (large posting arrays) with rare ones. The scan baseline is the per-task set check a
+plain implementation would do, run over the same board and checked against the index.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from itertools import accumulate
+from typing import Any, Dict, List
+
+from benchmarks.common import load_problem_module
+
+
+def build(tasks: int, tag_count: int, tags_per_task: int, seed: int):
+    module = load_problem_module("task_manager")
+    rng = random.Random(seed)
+    vocabulary = [f"tag-{i}" for i in range(tag_count)]
+    cum_weights = list(accumulate(1 / (rank + 1) for rank in range(tag_count)))
+    manager = module.TaskManager()
+    start = time.perf_counter()
+    for task_id in range(1, tasks + 1):
+        manager.create_task(f"Task {task_id}", "")
+    created = time.perf_counter()
+    for task_id in range(1, tasks + 1):
+        manager.add_task_tags(task_id, rng.choices(vocabulary, cum_weights=cum_weights, k=tags_per_task))
+    tagged = time.perf_counter()
+    return manager, vocabulary, cum_weights, {"create_seconds": created - start, "tag_seconds": tagged - created}
+
+
+def scan(manager: Any, tags: List[str], match_all: bool) -> List[int]:
+    check = all if match_all else any
+    return [task.id for task in manager.tasks.values() if check(tag in task.tags for tag in tags)]
+
+
+def run(tasks: int, tag_count: int, tags_per_task: int, queries: int, scan_queries: int, seed: int) -> Dict[str, Any]:
+    manager, vocabulary, cum_weights, results = build(tasks, tag_count, tags_per_task, seed)
+    rng = random.Random(seed + 1)
+    workload = [
+        (rng.choices(vocabulary, cum_weights=cum_weights, k=rng.randrange(2, 4)), match_all)
+        for _ in range(queries)
+        for match_all in (True, False)
+    ]
+
+    # The first read of each tag merges the buffered inserts from bulk tagging
+    start = time.perf_counter()
+    manager.get_tasks_by_tags(vocabulary, match_all=False)
+    results["merge_seconds"] = time.perf_counter() - start
+
+    for match_all in (True, False):
+        mode = "and" if match_all else "or"
+        batch = [tags for tags, flag in workload if flag is match_all]
+        matched = 0
+        start = time.perf_counter()
+        for tags in batch:
+            matched += len(manager.get_tasks_by_tags(tags, match_all=match_all))
+        indexed = (time.perf_counter() - start) / len(batch)
+
+        sample = batch[:scan_queries]
+        start = time.perf_counter()
+        for tags in sample:
+            expected = scan(manager, tags, match_all)
+            if [task.id for task in manager.get_tasks_by_tags(tags, match_all=match_all)] != expected:
+                raise AssertionError(f"index and scan disagree for {tags} ({mode})")
+        scanned = (time.perf_counter() - start) / len(sample)
+
+        results[mode] = {
+            "queries": len(batch),
+            "mean_results": matched / len(batch),
+            "index_ms": indexed * 1e3,
+            # includes one verifying index query per scan
+            "scan_ms": scanned * 1e3,
+        }
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark TaskManager tag queries")
+    parser.add_argument("--tasks", type=int, default=1_000_000, help="Tasks on the board (default: 1e6)")
+    parser.add_argument("--tags", type=int, default=1000, help="Tag vocabulary size (default: 1e3)")
+    parser.add_argument("--tags-per-task", type=int, default=3)
+    parser.add_argument("--queries", type=int, default=200, help="Indexed queries per mode")
+    parser.add_argument("--scan-queries", type=int, default=5, help="Scan queries per mode (slow)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=str, default=None, help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = run(args.tasks, args.tags, args.tags_per_task, args.queries, args.scan_queries, args.seed)
+    print(f"tasks={args.tasks} tags={args.tags} tags/task={args.tags_per_task}")
+    print(f"build: create {results['create_seconds']:.2f}s, tag {results['tag_seconds']:.2f}s, "
+          f"first merge {results['merge_seconds']:.2f}s")
+    print(f"{'mode':>4}  {'results':>9}  {'index ms':>9}  {'scan ms':>9}  {'speedup':>7}")
+    for mode in ("and", "or"):
+        row = results[mode]
+        print(f"{mode:>4}  {row['mean_results']:>9.0f}  {row['index_ms']:>9.3f}  {row['scan_ms']:>9.1f}"
+              f"  {row['scan_ms'] / row['index_ms']:>7.0f}")
+    if args.json:
+        with open(args.json, "w") as handle:
+            json.dump(results, handle, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
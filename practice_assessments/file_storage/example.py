@@ -7,7 +7,7 @@ from functools import wraps
 from framework.simulator import make_simulator
 
 
-@dataclass
+@dataclass(slots=True)
 class File:
     name: str
     size: int
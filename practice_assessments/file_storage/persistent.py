@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import random
+from heapq import heapify, heappop, heappush
+from typing import Any, Callable, Iterator, Optional, Tuple
+
+
+_NONE = float("-inf")
+
+# Lifetime of one value: (epoch, expires_at, ttl), with inf for values that do not expire
+Lifetime = Tuple[int, float, float]
+# Lifetimes of a subtree: (newest epoch, latest expiry among values of that epoch,
+# longest ttl among values of older epochs, longest ttl overall); a lone value's is
+# its Lifetime with no older values
+Alive = Tuple[int, float, float, float]
+
+
+def _alive(life: Lifetime) -> Alive:
+    return (life[0], life[1], _NONE, life[2])
+
+
+def _join(alive: Alive, other: Alive) -> Alive:
+    epoch, latest, older, longest = alive
+    other_epoch, other_latest, other_older, other_longest = other
+    if other_epoch > epoch:
+        # everything in `alive` is older than other's newest epoch
+        return (other_epoch, other_latest, max(other_older, longest), max(longest, other_longest))
+    if other_epoch < epoch:
+        return (epoch, latest, max(older, other_longest), max(longest, other_longest))
+    return (epoch, max(latest, other_latest), max(older, other_older), max(longest, other_longest))
+
+
+class _Node:
+    __slots__ = ("key", "value", "rank", "life", "priority", "left", "right", "size", "best", "alive")
+
+    def __init__(
+        self,
+        key: Any,
+        value: Any,
+        rank: Any,
+        life: Optional[Alive],
+        priority: float,
+        left: Optional[_Node],
+        right: Optional[_Node],
+    ):
+        self.key = key
+        self.value = value
+        self.rank = rank
+        self.life = life
+        self.priority = priority
+        self.left = left
+        self.right = right
+        self.size = 1 + (left.size if left else 0) + (right.size if right else 0)
+        # smallest rank anywhere in this subtree
+        best = rank
+        if left is not None and left.best < best:
+            best = left.best
+        if right is not None and right.best < best:
+            best = right.best
+        self.best = best
+        # lifetimes below this node, or None without lifetimes; this runs for every node on
+        # every write path, so matching summaries (the usual case) are not joined
+        alive = life
+        if life is not None:
+            if left is not None and left.alive != alive:
+                alive = _join(alive, left.alive)
+            if right is not None and right.alive != alive:
+                alive = _join(alive, right.alive)
+        self.alive = alive
+
+
+def _alive_at(alive: Alive, timestamp: int, epoch: int, rebased_at: int) -> bool:
+    """Whether anything summarised by `alive` (a subtree's, or one node's own) lives at `timestamp`.
+
+    Values from older epochs than `epoch` count as written at `rebased_at`.
+    """
+    newest, latest, older, longest = alive
+    if newest == epoch:
+        return latest > timestamp or rebased_at + older > timestamp
+    return rebased_at + longest > timestamp
+
+
+def _copy(node: _Node, left: Optional[_Node], right: Optional[_Node]) -> _Node:
+    return _Node(node.key, node.value, node.rank, node.life, node.priority, left, right)
+
+
+def _insert(
+    node: Optional[_Node], key: Any, value: Any, rank: Any, life: Optional[Alive], priority: float
+) -> _Node:
+    """Return a copy of the treap rooted at `node` with `key` set, copying only the search path."""
+    if node is None:
+        return _Node(key, value, rank, life, priority, None, None)
+    if key == node.key:
+        return _Node(key, value, rank, life, node.priority, node.left, node.right)
+    if key < node.key:
+        left = _insert(node.left, key, value, rank, life, priority)
+        if left.priority > node.priority:
+            return _copy(left, left.left, _copy(node, left.right, node.right))
+        return _copy(node, left, node.right)
+    right = _insert(node.right, key, value, rank, life, priority)
+    if right.priority > node.priority:
+        return _copy(right, _copy(node, node.left, right.left), right.right)
+    return _copy(node, node.left, right)
+
+
+def _merge(left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+    """Join two treaps where every key in `left` sorts before every key in `right`."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        return _copy(left, left.left, _merge(left.right, right))
+    return _copy(right, _merge(left, right.left), right.right)
+
+
+def _remove(node: _Node, key: Any) -> Optional[_Node]:
+    if key == node.key:
+        return _merge(node.left, node.right)
+    if key < node.key:
+        return _copy(node, _remove(node.left, key), node.right)
+    return _copy(node, node.left, _remove(node.right, key))
+
+
+def _cover(node: Optional[_Node], lo: Any, hi: Any, parts: list) -> None:
+    """Append heap entries covering exactly the keys in [lo, hi) below `node`; None means unbounded.
+
+    Only the two boundary paths are walked; everything between them is added
+    as whole subtrees, so there are O(log N) entries.
+    """
+    while node is not None:
+        if lo is None and hi is None:
+            parts.append((node.best, True, node))
+            return
+        if lo is not None and node.key < lo:
+            node = node.right
+        elif hi is not None and node.key >= hi:
+            node = node.left
+        else:
+            parts.append((node.rank, False, node))
+            _cover(node.left, lo, None, parts)
+            _cover(node.right, None, hi, parts)
+            return
+
+
+class PersistentMap:
+    """Immutable sorted map backed by a path-copying treap.
+
+    `set` returns a new map and leaves the original untouched; both versions
+    share every node off the updated path, so holding on to old versions
+    (e.g. as rollback snapshots) costs O(log N) per write instead of a full copy.
+
+    Every node also carries `rank(value)` and the smallest rank in its subtree,
+    which lets `ranked` walk values in rank order lazily. Ranks must be distinct
+    (include the key to break ties); without a rank function values rank by key.
+
+    Values may also expire: `lifetime(value)` gives `(epoch, expires_at, ttl)`, and
+    every node keeps the latest expiry below it, so `ranked(..., alive_at=...)` skips
+    whole subtrees with nothing alive. Epochs let a caller rebase every older value at
+    once: a value from an epoch older than the query's counts as written at the
+    query's `rebased_at`, i.e. it expires at `rebased_at + ttl`.
+    """
+
+    __slots__ = ("_root", "_rank", "_lifetime")
+
+    def __init__(
+        self,
+        rank: Optional[Callable[[Any], Any]] = None,
+        root: Optional[_Node] = None,
+        lifetime: Optional[Callable[[Any], Lifetime]] = None,
+    ):
+        self._rank = rank
+        self._root = root
+        self._lifetime = lifetime
+
+    def empty(self) -> PersistentMap:
+        return PersistentMap(self._rank, lifetime=self._lifetime)
+
+    def _find(self, key: Any) -> Optional[_Node]:
+        node = self._root
+        while node is not None:
+            if key == node.key:
+                return node
+            node = node.left if key < node.key else node.right
+        return None
+
+    def __len__(self) -> int:
+        return self._root.size if self._root else 0
+
+    def __contains__(self, key: Any) -> bool:
+        return self._find(key) is not None
+
+    def __getitem__(self, key: Any) -> Any:
+        node = self._find(key)
+        if node is None:
+            raise KeyError(key)
+        return node.value
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        node = self._find(key)
+        return default if node is None else node.value
+
+    def set(self, key: Any, value: Any) -> PersistentMap:
+        rank = self._rank(value) if self._rank else key
+        life = _alive(self._lifetime(value)) if self._lifetime else None
+        return PersistentMap(self._rank, _insert(self._root, key, value, rank, life, random.random()), self._lifetime)
+
+    def remove(self, key: Any) -> PersistentMap:
+        if key not in self:
+            raise KeyError(key)
+        return PersistentMap(self._rank, _remove(self._root, key), self._lifetime)
+
+    def ranked(
+        self, lo: Any = None, hi: Any = None, alive_at: Optional[Tuple[int, int, int]] = None
+    ) -> Iterator[Any]:
+        """Yield values with keys in [lo, hi) in ascending rank order.
+
+        Best-first search over subtree minimums: producing the first k values
+        touches O(k log N) nodes, and keys outside the range are never visited,
+        so callers that stop early never pay for the rest.
+
+        With `alive_at=(timestamp, epoch, rebased_at)` (requires a lifetime function)
+        only values still alive at `timestamp` are yielded, and subtrees where every
+        value has expired are never entered.
+        """
+        # (rank, is_subtree, node): a lone node sorts before the subtree whose best it is
+        heap = []
+        _cover(self._root, lo, hi, heap)
+        if alive_at is not None:
+            timestamp, epoch, rebased_at = alive_at
+            heap = [
+                part for part in heap
+                if _alive_at(part[2].alive if part[1] else part[2].life, timestamp, epoch, rebased_at)
+            ]
+        heapify(heap)
+        while heap:
+            _, is_subtree, node = heappop(heap)
+            if not is_subtree:
+                yield node.value
+                continue
+            if alive_at is None or _alive_at(node.life, timestamp, epoch, rebased_at):
+                heappush(heap, (node.rank, False, node))
+            for child in (node.left, node.right):
+                if child is not None and (alive_at is None or _alive_at(child.alive, timestamp, epoch, rebased_at)):
+                    heappush(heap, (child.best, True, child))
+
+    def _nodes(self) -> Iterator[_Node]:
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node
+            node = node.right
+
+    def __iter__(self) -> Iterator[Any]:
+        for node in self._nodes():
+            yield node.key
+
+    def items(self) -> Iterator[Tuple[Any, Any]]:
+        for node in self._nodes():
+            yield node.key, node.value
+
+    def values(self) -> Iterator[Any]:
+        for node in self._nodes():
+            yield node.value
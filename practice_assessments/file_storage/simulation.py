@@ -1,36 +1,154 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
-from copy import deepcopy
+from heapq import heapify, heappop, heappush
+from itertools import count, islice
+
+from sortedcontainers import SortedDict
 
 from framework.simulator import make_simulator
+from persistent import PersistentMap
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class File:
     name: str
     size: int
     timestamp: int = 0
     ttl: int | None = None
+    # rollback generation the timestamp was written in (see FileStorage._timestamp)
+    epoch: int = 0
+
+    def renamed(self, name: str, timestamp: int | None = None, epoch: int | None = None) -> File:
+        # Files are shared between the live map, checkpoints and the expiry heap,
+        # so copies are derived rather than mutated.
+        return File(
+            name,
+            self.size,
+            self.timestamp if timestamp is None else timestamp,
+            self.ttl,
+            self.epoch if epoch is None else epoch,
+        )
+
+def _search_rank(file: File) -> tuple[int, str]:
+    return (-file.size, file.name)
+
+def _lifetime(file: File) -> tuple[int, float, float]:
+    if file.ttl is None:
+        return (file.epoch, float("inf"), float("inf"))
+    return (file.epoch, file.timestamp + file.ttl, file.ttl)
+
+def _prefix_end(prefix: str) -> str | None:
+    # smallest string sorting after every string that starts with prefix
+    stem = prefix.rstrip(chr(sys.maxunicode))
+    if not stem:
+        return None
+    return stem[:-1] + chr(ord(stem[-1]) + 1)
+
+@dataclass(slots=True)
+class Operation:
+    # "upload", "copy", "purge" or "rollback"; timestamp is None for the untimed variants
+    kind: str
+    timestamp: int | None
+    name: str | None = None
+    size: int | None = None
+    ttl: int | None = None
+    source: str | None = None
+    # files removed by a purge
+    names: tuple[str, ...] = ()
 
 class FileStorage:
-    def __init__(self):
-        self.files = {}
-        self.backups = {}
+    def __init__(self, checkpoint_interval: int = 32):
+        if checkpoint_interval < 1:
+            raise ValueError("Checkpoint interval must be at least 1.")
+        self.checkpoint_interval = checkpoint_interval
+        # name -> File, also ordered by _search_rank for file_search and masking
+        # dead files for file_search_at
+        self.files = PersistentMap(rank=_search_rank, lifetime=_lifetime)
+        # Append-only record of every change to self.files, in arrival order.
+        self.log = []
+        # log position -> files after replaying log[:position]
+        self.checkpoints = SortedDict({0: self.files})
+        # timestamp -> log position right after the last write at that timestamp
+        self.timeline = SortedDict()
+        # A rollback rebases every restored file onto the rollback timestamp.
+        # Rather than rewriting each file, bump the epoch: files from an older
+        # epoch read their timestamp from _rollback_timestamp.
+        self._epoch = 0
+        self._rollback_timestamp = 0
+        # min-heap of (expires_at, seq, name, file) for files with a ttl; entries
+        # whose file has since been replaced are skipped when popped. A rollback
+        # changes every expiry, so it drops the heap and marks it stale; the next
+        # purge rebuilds it from the live files.
+        self._expiry = []
+        self._expiry_seq = count()
+        self._expiry_stale = False
+        # total files removed by purge_expired
+        self.reclaimed = 0
+
+    def _timestamp(self, file: File) -> int:
+        if file.epoch == self._epoch:
+            return file.timestamp
+        return self._rollback_timestamp
 
     def _is_alive(self, timestamp: int, name: str):
         if not name in self.files:
             raise RuntimeError("File does not exist.")
-        file = self.files[name]
+        return self._is_file_alive(timestamp, self.files[name])
+
+    def _is_file_alive(self, timestamp: int, file: File) -> bool:
         if file.ttl == None:
             return True
-        return timestamp < file.timestamp + file.ttl
+        return timestamp < self._timestamp(file) + file.ttl
 
-    def _backup(self, timestamp: int) -> None:
-        self.backups[timestamp] = deepcopy(self.files)
+    def _push_expiry(self, file: File) -> None:
+        # A stale heap is rebuilt from self.files anyway
+        if file.ttl is not None and not self._expiry_stale:
+            heappush(self._expiry, (self._timestamp(file) + file.ttl, next(self._expiry_seq), file.name, file))
+
+    def _rebuild_expiry(self) -> None:
+        self._expiry = [
+            (self._timestamp(file) + file.ttl, next(self._expiry_seq), file.name, file)
+            for file in self.files.values()
+            if file.ttl is not None
+        ]
+        heapify(self._expiry)
+        self._expiry_stale = False
+
+    def _apply(self, files: PersistentMap, op: Operation) -> PersistentMap:
+        if op.kind == "purge":
+            for name in op.names:
+                files = files.remove(name)
+            return files
+        if op.kind == "upload":
+            timestamp = 0 if op.timestamp is None else op.timestamp
+            file = File(name=op.name, size=op.size, timestamp=timestamp, ttl=op.ttl, epoch=self._epoch)
+        elif op.timestamp is None:
+            file = files[op.source].renamed(op.name)
+        else:
+            file = files[op.source].renamed(op.name, op.timestamp, self._epoch)
+        return files.set(op.name, file)
+
+    def _record(self, op: Operation) -> None:
+        self.files = self._apply(self.files, op)
+        self.log.append(op)
+        if op.kind != "purge":
+            if op.timestamp is not None:
+                self.timeline[op.timestamp] = len(self.log)
+            self._push_expiry(self.files[op.name])
+        if len(self.log) - self.checkpoints.peekitem(-1)[0] >= self.checkpoint_interval:
+            self.checkpoints[len(self.log)] = self.files
+
+    def _replay(self, position: int) -> PersistentMap:
+        index = self.checkpoints.bisect_right(position) - 1
+        start, files = self.checkpoints.peekitem(index)
+        for op in islice(self.log, start, position):
+            files = self._apply(files, op)
+        return files
 
     def file_upload(self, name: str, size: int) -> None:
         if not name in self.files:
-            self.files[name] = File(name=name, size=size)
+            self._record(Operation("upload", None, name=name, size=size))
         else:
             raise RuntimeError("File already exists.")
     
@@ -41,27 +159,23 @@ class FileStorage:
     
     def file_copy(self, source: str, dest: str) -> None:
         if source in self.files:
-            self.files[dest] = deepcopy(self.files[source])
-            self.files[dest].name = dest
+            self._record(Operation("copy", None, name=dest, source=source))
         else:
             raise RuntimeError("Source file does not exist.")
 
     def file_search(self, prefix: str):
-        sorted_files = sorted(self.files.items(), key=lambda f:(-f[1].size, f[1].name))
         top_10 = []
-        for file in sorted_files:
+        for file in self.files.ranked(prefix, _prefix_end(prefix)):
             if len(top_10) >= 10:
                 break
-            if file[1].name.startswith(prefix):
-                top_10.append(file[1].name)
+            top_10.append(file.name)
         return top_10
 
     def file_upload_at(self, timestamp: int, name: str, size: int, ttl: int = None) -> None:
         if not name in self.files:
-            self.files[name] = File(name=name, size=size, timestamp=timestamp, ttl=ttl)
+            self._record(Operation("upload", timestamp, name=name, size=size, ttl=ttl))
         else:
             raise RuntimeError("File already exists.")
-        self._backup(timestamp)
     
     def file_get_at(self, timestamp: int, name: str) -> int:
         if name in self.files and self._is_alive(timestamp, name):
@@ -70,33 +184,52 @@ class FileStorage:
     
     def file_copy_at(self, timestamp: int, source: str, dest: str) -> None:
         if source in self.files and self._is_alive(timestamp, source):
-            self.files[dest] = deepcopy(self.files[source])
-            self.files[dest].name = dest
-            self.files[dest].timestamp = timestamp
+            self._record(Operation("copy", timestamp, name=dest, source=source))
         else:
             raise RuntimeError("Source file does not exist or is dead.")
-        self._backup(timestamp)
 
     def file_search_at(self, timestamp: int, prefix: str):
-        sorted_files = sorted(self.files.items(), key=lambda f:(-f[1].size, f[1].name))
         top_10 = []
-        for file in sorted_files:
+        alive_at = (timestamp, self._epoch, self._rollback_timestamp)
+        for file in self.files.ranked(prefix, _prefix_end(prefix), alive_at):
             if len(top_10) >= 10:
                 break
-            if file[1].name.startswith(prefix) and self._is_alive(timestamp, file[0]):
-                top_10.append(file[1].name)
+            top_10.append(file.name)
         return top_10
 
     def rollback(self, timestamp: int) -> None:
-        sorted_backups = sorted(self.backups)
-        backed_up = False
-        for backup in sorted_backups:
-            if timestamp >= backup:
-                self.files = deepcopy(self.backups[backup])
-                for file in self.files.items():
-                    file[1].timestamp = timestamp
-                backed_up = True
-        if not backed_up:
-            self.files = {}
+        index = self.timeline.bisect_right(timestamp)
+        if index:
+            self.files = self._replay(self.timeline.peekitem(index - 1)[1])
+        else:
+            self.files = self.files.empty()
+        self._epoch += 1
+        self._rollback_timestamp = timestamp
+        # Every expiry moved; let go of the heap (and the files it holds) until the next purge
+        self._expiry = []
+        self._expiry_stale = True
+        # Checkpoint the restored state so later replays never step over a rollback.
+        self.log.append(Operation("rollback", timestamp))
+        self.checkpoints[len(self.log)] = self.files
+
+    def purge_expired(self, timestamp: int) -> int:
+        """Drop every file that is dead at `timestamp` and return how many were removed.
+
+        Searches already skip dead files without visiting them, but the files stay
+        in memory until a purge removes them for good. A purge is logged like any other change,
+        so purged files do not come back when rolling back to a later snapshot.
+        """
+        if self._expiry_stale:
+            self._rebuild_expiry()
+        purged = []
+        while self._expiry and self._expiry[0][0] <= timestamp:
+            _, _, name, file = heappop(self._expiry)
+            if self.files.get(name) is file:
+                purged.append(name)
+        if purged:
+            self._record(Operation("purge", timestamp, names=tuple(purged)))
+            self.reclaimed += len(purged)
+        return len(purged)
+
 
 simulate_coding_framework = make_simulator(FileStorage)
\ No newline at end of file
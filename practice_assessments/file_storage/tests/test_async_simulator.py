@@ -0,0 +1,90 @@
+import asyncio
+import unittest
+from framework.async_simulator import make_async_simulator
+from simulation import FileStorage, simulate_coding_framework
+
+
+def tenant_commands(tenant):
+    return [
+        ["FILE_UPLOAD", f"{tenant}.txt", len(tenant)],
+        ["FILE_UPLOAD_AT", 1000, "shared.txt", 5, 10],
+        ["FILE_GET", f"{tenant}.txt"],
+        ["FILE_GET_AT", 1009, "shared.txt"],
+        ["FILE_SEARCH", ""],
+    ]
+
+
+class TestAsyncSimulator(unittest.TestCase):
+    def test_sessions_are_independent(self):
+        streams = {tenant: tenant_commands(tenant) for tenant in ("a", "bb", "ccc")}
+        simulator = make_async_simulator(FileStorage, chunk_size=2, max_sessions=2)
+        outputs = asyncio.run(simulator.run(streams))
+        self.assertEqual(outputs, {tenant: simulate_coding_framework(commands) for tenant, commands in streams.items()})
+        stats = simulator.stats()
+        self.assertEqual(stats["bb"].commands, 5)
+        self.assertGreaterEqual(stats["bb"].max_latency, stats["bb"].mean_latency)
+
+    def test_async_iterable_streams(self):
+        async def produce():
+            for command in tenant_commands("x"):
+                yield command
+
+        simulator = make_async_simulator(FileStorage)
+        outputs = asyncio.run(simulator.run({"x": produce()}))
+        self.assertEqual(outputs["x"], simulate_coding_framework(tenant_commands("x")))
+
+    def test_queue_depth_is_bounded_by_max_pending(self):
+        async def scenario():
+            simulator = make_async_simulator(FileStorage, max_pending=2, chunk_size=1)
+            session = simulator.open_session("t")
+            await session.send(["FILE_UPLOAD", "a", 1])
+            for _ in range(50):
+                await session.send(["FILE_GET", "a"])
+            self.assertEqual(await session.close(), [None] + [1] * 50)
+            self.assertEqual(session.stats.max_queue_depth, 2)
+            self.assertEqual(session.stats.commands, 51)
+
+        asyncio.run(scenario())
+
+    def test_closed_sessions_are_dropped_and_ids_reusable(self):
+        simulator = make_async_simulator(FileStorage)
+        first = asyncio.run(simulator.run({"a": tenant_commands("a")}))
+        self.assertEqual(simulator.sessions, {})
+        second = asyncio.run(simulator.run({"a": tenant_commands("a")}))
+        self.assertEqual(first, second)
+        self.assertEqual(simulator.stats()["a"].commands, 5)
+
+    def test_failed_session_does_not_sink_the_run(self):
+        simulator = make_async_simulator(FileStorage, chunk_size=1, max_pending=1)
+        failing = [["FILE_COPY", "missing", "b"]] + [["FILE_GET", "x"]] * 20
+        outputs = asyncio.run(simulator.run({"a": failing, "b": tenant_commands("b")}))
+        self.assertIsInstance(outputs["a"], RuntimeError)
+        self.assertEqual(outputs["b"], simulate_coding_framework(tenant_commands("b")))
+        self.assertEqual(simulator.sessions, {})
+        outputs = asyncio.run(simulator.run({"a": tenant_commands("a")}))
+        self.assertEqual(outputs["a"], simulate_coding_framework(tenant_commands("a")))
+
+    def test_default_ids_skip_caller_ids(self):
+        async def scenario():
+            simulator = make_async_simulator(FileStorage)
+            simulator.open_session(1)
+            ids = [simulator.open_session().id for _ in range(3)]
+            self.assertEqual(ids, [0, 2, 3])
+            for session in list(simulator.sessions.values()):
+                await session.close()
+            self.assertEqual(simulator.open_session().id, 4)
+
+        asyncio.run(scenario())
+
+    def test_errors_surface_on_close(self):
+        async def scenario():
+            session = make_async_simulator(FileStorage).open_session()
+            await session.send(["FILE_COPY", "missing", "b"])
+            with self.assertRaises(RuntimeError):
+                await session.close()
+
+        asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import random
+import unittest
+import example
+from simulation import FileStorage, Operation
+
+
+def random_commands(seed, count=400):
+    rng = random.Random(seed)
+    t0 = 1625140800000
+    names = [f"f{i}.txt" for i in range(25)]
+    commands = []
+    for _ in range(count):
+        timestamp = t0 + rng.randrange(0, 5000)
+        roll = rng.random()
+        if roll < 0.35:
+            ttl = rng.choice([None, 500, 2000])
+            commands.append(("file_upload_at", timestamp, rng.choice(names), rng.randrange(1, 50), ttl))
+        elif roll < 0.55:
+            commands.append(("file_copy_at", timestamp, rng.choice(names), rng.choice(names)))
+        elif roll < 0.6:
+            commands.append(("file_upload", rng.choice(names), rng.randrange(1, 50)))
+        elif roll < 0.65:
+            commands.append(("file_copy", rng.choice(names), rng.choice(names)))
+        elif roll < 0.8:
+            commands.append(("file_search_at", timestamp, rng.choice(["", "f1", "f2"])))
+        elif roll < 0.9:
+            commands.append(("file_get_at", timestamp, rng.choice(names)))
+        else:
+            commands.append(("rollback", timestamp))
+    return commands
+
+
+def run(store, commands):
+    outputs = []
+    for method, *args in commands:
+        try:
+            outputs.append(getattr(store, method)(*args))
+        except RuntimeError:
+            outputs.append("error")
+    return outputs
+
+
+class TestEventLog(unittest.TestCase):
+    def test_log_records_every_change(self):
+        store = FileStorage()
+        t0 = 1625140800000
+        store.file_upload("A.txt", 1)
+        store.file_upload_at(t0, "B.txt", 2, ttl=10)
+        store.file_copy_at(t0 + 1, "B.txt", "C.txt")
+        store.file_get_at(t0 + 1, "C.txt")
+        store.rollback(t0)
+        self.assertEqual(store.log, [
+            Operation("upload", None, name="A.txt", size=1),
+            Operation("upload", t0, name="B.txt", size=2, ttl=10),
+            Operation("copy", t0 + 1, name="C.txt", source="B.txt"),
+            Operation("rollback", t0),
+        ])
+
+    def test_checkpoint_interval(self):
+        store = FileStorage(checkpoint_interval=3)
+        for i in range(7):
+            store.file_upload_at(i, f"{i}.txt", i)
+        self.assertEqual(list(store.checkpoints), [0, 3, 6])
+        with self.assertRaises(ValueError):
+            FileStorage(checkpoint_interval=0)
+
+    def test_replay_matches_reference_for_any_interval(self):
+        for seed in range(5):
+            commands = random_commands(seed)
+            expected = run(example.FileStorage(), commands)
+            for interval in (1, 4, 32, 1000):
+                with self.subTest(seed=seed, interval=interval):
+                    self.assertEqual(run(FileStorage(checkpoint_interval=interval), commands), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
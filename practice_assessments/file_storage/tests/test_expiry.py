@@ -0,0 +1,110 @@
+import random
+import unittest
+from persistent import PersistentMap
+from simulation import FileStorage
+
+
+class TestPurgeExpired(unittest.TestCase):
+    def setUp(self):
+        self.store = FileStorage()
+        self.t0 = 1625140800000
+
+    def test_purge_removes_only_dead_files(self):
+        t0 = self.t0
+        self.store.file_upload_at(t0, "Keep.txt", 1)
+        self.store.file_upload_at(t0, "Short.txt", 2, ttl=1000)
+        self.store.file_upload_at(t0, "Long.txt", 3, ttl=5000)
+
+        self.assertEqual(self.store.purge_expired(t0 + 999), 0)
+        self.assertEqual(self.store.purge_expired(t0 + 1000), 1)
+        self.assertNotIn("Short.txt", self.store.files)
+        self.assertEqual(self.store.file_search_at(t0 + 1000, ""), ["Long.txt", "Keep.txt"])
+        self.assertEqual(self.store.purge_expired(t0 + 10_000), 1)
+        self.assertEqual(list(self.store.files), ["Keep.txt"])
+        self.assertEqual(self.store.reclaimed, 2)
+
+    def test_replaced_file_is_not_purged_by_stale_entry(self):
+        t0 = self.t0
+        self.store.file_upload_at(t0, "A.txt", 1, ttl=100)
+        self.store.file_upload_at(t0, "B.txt", 2)
+        # Overwrite A.txt with an immortal copy of B.txt; the old expiry entry must be ignored
+        self.store.file_copy_at(t0, "B.txt", "A.txt")
+        self.assertEqual(self.store.purge_expired(t0 + 200), 0)
+        self.assertEqual(self.store.file_get_at(t0 + 200, "A.txt"), 2)
+
+    def test_purge_after_rollback_uses_rebased_expiry(self):
+        t0 = self.t0
+        self.store.file_upload_at(t0, "A.txt", 1, ttl=100)
+        self.store.rollback(t0 + 1000)
+        self.assertEqual(self.store.purge_expired(t0 + 1099), 0)
+        self.assertEqual(self.store.purge_expired(t0 + 1100), 1)
+
+    def test_purge_is_replayed_on_rollback(self):
+        t0 = self.t0
+        for interval in (1, 2, 32):
+            store = FileStorage(checkpoint_interval=interval)
+            store.file_upload_at(t0, "A.txt", 1, ttl=100)
+            store.purge_expired(t0 + 500)
+            store.file_upload_at(t0 + 600, "B.txt", 2)
+            store.rollback(t0 + 700)
+            self.assertEqual(list(store.files), ["B.txt"])
+            # Snapshots from before the purge still hold the file
+            store.rollback(t0 + 1)
+            self.assertEqual(list(store.files), ["A.txt"])
+
+    def test_rollback_drops_the_expiry_heap(self):
+        t0 = self.t0
+        self.store.file_upload_at(t0, "A.txt", 1, ttl=100)
+        self.store.rollback(t0 + 10)
+        self.store.file_upload_at(t0 + 20, "B.txt", 2, ttl=100)
+        self.assertEqual(self.store._expiry, [])
+        self.assertEqual(self.store.purge_expired(t0 + 115), 1)
+        self.assertEqual(list(self.store.files), ["B.txt"])
+
+
+class TestSearchSkipsDeadFiles(unittest.TestCase):
+    def test_search_matches_a_scan_of_live_files(self):
+        rng = random.Random(3)
+        store = FileStorage(checkpoint_interval=8)
+        clock = 1625140800000
+        for _ in range(2000):
+            clock += rng.randrange(5)
+            roll = rng.random()
+            name = f"d{rng.randrange(3)}/f{rng.randrange(60)}"
+            if roll < 0.5:
+                if name not in store.files:
+                    store.file_upload_at(clock, name, rng.randrange(100), rng.choice([None, 5, 50, 500]))
+            elif roll < 0.6 and len(store.files):
+                source = rng.choice(list(store.files))
+                if store.file_get_at(clock, source) is not None:
+                    store.file_copy_at(clock, source, name)
+            elif roll < 0.63:
+                store.rollback(clock - rng.randrange(100))
+            elif roll < 0.65:
+                store.purge_expired(clock)
+            else:
+                prefix = rng.choice(["", "d0", "d1/", "d2/f1"])
+                live = [
+                    file for file in store.files.values()
+                    if file.name.startswith(prefix) and store._is_file_alive(clock, file)
+                ]
+                expected = [file.name for file in sorted(live, key=lambda file: (-file.size, file.name))[:10]]
+                self.assertEqual(store.file_search_at(clock, prefix), expected)
+
+
+class TestPersistentRemove(unittest.TestCase):
+    def test_remove_keeps_old_version(self):
+        m = PersistentMap()
+        for i in range(100):
+            m = m.set(i, i * i)
+        removed = m
+        for i in range(0, 100, 3):
+            removed = removed.remove(i)
+        self.assertEqual(len(m), 100)
+        self.assertEqual(list(removed), [i for i in range(100) if i % 3])
+        with self.assertRaises(KeyError):
+            removed.remove(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -88,6 +88,17 @@ class TestLevel4Rollback(unittest.TestCase):
         self.assertEqual(self.store.file_get_at(t2 + 2999, "TTL.txt"), 1)
         self.assertIsNone(self.store.file_get_at(t2 + 3000, "TTL.txt"))
 
+    def test_rollback_picks_latest_snapshot_when_written_out_of_order(self):
+        t0 = 1625140800000
+        self.store.file_upload_at(t0 + 2000, "Late.txt", 2)
+        self.store.file_upload_at(t0, "Early.txt", 1)
+        # Rolling back to exactly t0 restores the snapshot taken at t0, which already has Late.txt
+        self.store.rollback(t0)
+        self.assertEqual(self.store.file_get_at(t0, "Early.txt"), 1)
+        self.assertEqual(self.store.file_get_at(t0, "Late.txt"), 2)
+        self.store.rollback(t0 - 1)
+        self.assertIsNone(self.store.file_get_at(t0, "Early.txt"))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+from framework.parallel_simulator import make_parallel_simulator
+from simulation import FileStorage, simulate_coding_framework
+
+
+def session_commands(index):
+    return [
+        ["FILE_UPLOAD", f"s{index}.txt", index],
+        ["FILE_UPLOAD_AT", 1000, f"t{index}.txt", index * 2, 100],
+        ["FILE_GET", f"s{index}.txt"],
+        ["FILE_SEARCH_AT", 1050, ""],
+        ["ROLLBACK", 999],
+        ["FILE_GET_AT", 1050, f"t{index}.txt"],
+    ]
+
+
+class TestParallelSimulator(unittest.TestCase):
+    def test_results_match_serial_in_input_order(self):
+        sessions = [session_commands(i) for i in range(10)]
+        expected = [simulate_coding_framework(commands) for commands in sessions]
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                simulate = make_parallel_simulator(FileStorage, workers=workers, shards_per_worker=2)
+                self.assertEqual(simulate(sessions), expected)
+
+    def test_errors_propagate(self):
+        simulate = make_parallel_simulator(FileStorage, workers=2)
+        with self.assertRaises(RuntimeError):
+            simulate([session_commands(0), [["FILE_COPY", "missing", "x"]]])
+
+
+if __name__ == "__main__":
+    unittest.main()
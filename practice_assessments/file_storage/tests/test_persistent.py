@@ -0,0 +1,133 @@
+import random
+import unittest
+from persistent import PersistentMap
+from simulation import FileStorage
+
+
+class TestPersistentMap(unittest.TestCase):
+    def test_set_returns_new_version_and_keeps_old(self):
+        empty = PersistentMap()
+        one = empty.set("a", 1)
+        two = one.set("b", 2)
+        three = two.set("a", 10)
+
+        self.assertEqual(len(empty), 0)
+        self.assertEqual(dict(one.items()), {"a": 1})
+        self.assertEqual(dict(two.items()), {"a": 1, "b": 2})
+        self.assertEqual(dict(three.items()), {"a": 10, "b": 2})
+        self.assertNotIn("a", empty)
+        with self.assertRaises(KeyError):
+            empty["a"]
+        self.assertIsNone(empty.get("a"))
+
+    def test_iterates_in_key_order(self):
+        names = [f"file-{i:04d}.txt" for i in range(500)]
+        m = PersistentMap()
+        for name in reversed(names):
+            m = m.set(name, len(name))
+        self.assertEqual(list(m), names)
+        self.assertEqual(len(m), 500)
+
+    def test_ranked_yields_values_in_rank_order(self):
+        rank = lambda item: (-item[1], item[0])
+        m = PersistentMap(rank=rank)
+        items = [(f"f{i}", (i * 37) % 11) for i in range(200)]
+        for name, size in items:
+            m = m.set(name, (name, size))
+        m = m.set("f5", ("f5", 100))
+        expected = sorted(dict(m.items()).values(), key=rank)
+        self.assertEqual(list(m.ranked()), expected)
+        self.assertEqual(next(m.ranked()), ("f5", 100))
+        self.assertEqual(list(m.empty().ranked()), [])
+
+    def test_ranked_within_key_range(self):
+        rank = lambda item: (-item[1], item[0])
+        m = PersistentMap(rank=rank)
+        for i in range(300):
+            name = f"{'abc'[i % 3]}{i}"
+            m = m.set(name, (name, (i * 53) % 17))
+        for lo, hi in (("b", "c"), ("a1", "a2"), ("c", None), (None, "b"), ("z", None)):
+            expected = sorted(
+                (v for k, v in m.items() if (lo is None or k >= lo) and (hi is None or k < hi)), key=rank
+            )
+            self.assertEqual(list(m.ranked(lo, hi)), expected)
+
+    def test_ranked_skips_expired_values(self):
+        # Values are their own (epoch, expires_at, ttl) lifetimes
+        inf = float("inf")
+        rng = random.Random(5)
+        m = PersistentMap(lifetime=lambda life: life)
+        for i in range(400):
+            ttl = rng.choice([inf, 10, 100])
+            epoch = rng.randrange(3)
+            m = m.set(i, (epoch, rng.randrange(1000) + ttl, ttl))
+        for timestamp, epoch, rebased_at in ((0, 2, 0), (500, 2, 450), (1050, 2, 1000), (2000, 3, 1995)):
+            def alive(life):
+                return (life[1] if life[0] == epoch else rebased_at + life[2]) > timestamp
+
+            alive_at = (timestamp, epoch, rebased_at)
+            self.assertEqual(list(m.ranked(alive_at=alive_at)), [life for _, life in m.items() if alive(life)])
+            self.assertEqual(
+                list(m.ranked(100, 200, alive_at)), [life for key, life in m.items() if 100 <= key < 200 and alive(life)]
+            )
+
+class TestPrefixSearch(unittest.TestCase):
+    def test_search_only_returns_prefix_matches_in_size_order(self):
+        store = FileStorage()
+        for i in range(200):
+            store.file_upload(f"dir{i % 4}/file{i}.txt", i % 13)
+        matches = sorted(
+            (name for name in store.files if name.startswith("dir2/")), key=lambda n: (-store.file_get(n), n)
+        )
+        self.assertEqual(store.file_search("dir2/"), matches[:10])
+        self.assertEqual(store.file_search("dir2/file10"), ["dir2/file102.txt", "dir2/file10.txt", "dir2/file106.txt"])
+        self.assertEqual(store.file_search("dir9"), [])
+
+    def test_prefix_ending_in_max_code_point(self):
+        store = FileStorage()
+        edge = "a" + chr(0x10FFFF)
+        store.file_upload(edge + "x", 1)
+        store.file_upload("b", 2)
+        self.assertEqual(store.file_search(edge), [edge + "x"])
+
+
+class TestSnapshotSharing(unittest.TestCase):
+    def test_snapshots_are_not_affected_by_later_writes(self):
+        store = FileStorage(checkpoint_interval=1)
+        t0 = 1625140800000
+        store.file_upload_at(t0, "A.txt", 10)
+        snapshot = store.checkpoints[store.timeline[t0]]
+        store.file_upload_at(t0 + 1, "B.txt", 20)
+        store.file_copy_at(t0 + 2, "A.txt", "B.txt")
+
+        self.assertEqual(list(snapshot), ["A.txt"])
+        self.assertEqual(store.file_get_at(t0 + 2, "B.txt"), 10)
+
+    def test_rollback_rebases_timestamps_without_touching_snapshots(self):
+        store = FileStorage(checkpoint_interval=1)
+        t0 = 1625140800000
+        store.file_upload_at(t0, "A.txt", 1, ttl=100)
+        store.rollback(t0 + 50)
+        self.assertEqual(store.file_get_at(t0 + 149, "A.txt"), 1)
+        self.assertIsNone(store.file_get_at(t0 + 150, "A.txt"))
+        # The snapshot still holds the original record, so rolling back again rebases afresh
+        store.rollback(t0 + 500)
+        self.assertEqual(store.file_get_at(t0 + 599, "A.txt"), 1)
+        self.assertEqual(store.checkpoints[store.timeline[t0]]["A.txt"].timestamp, t0)
+
+    def test_copies_derive_new_records(self):
+        store = FileStorage()
+        t0 = 1625140800000
+        store.file_upload_at(t0, "A.txt", 5, ttl=10)
+        store.file_copy_at(t0 + 1, "A.txt", "B.txt")
+        store.file_copy("B.txt", "C.txt")
+        a, b, c = (store.files[name] for name in ("A.txt", "B.txt", "C.txt"))
+        self.assertEqual((a.name, a.timestamp), ("A.txt", t0))
+        self.assertEqual((b.name, b.size, b.timestamp, b.ttl), ("B.txt", 5, t0 + 1, 10))
+        self.assertEqual((c.name, c.timestamp), ("C.txt", t0 + 1))
+        with self.assertRaises(AttributeError):
+            a.size = 6
+
+
+if __name__ == "__main__":
+    unittest.main()
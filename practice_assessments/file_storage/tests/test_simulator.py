@@ -0,0 +1,161 @@
+import itertools
+import json
+import math
+import os
+import tempfile
+import unittest
+from framework.instrumentation import CommandStats, Instrumentation
+from framework.simulator import make_simulator, make_streaming_simulator, read_commands
+from simulation import FileStorage, simulate_coding_framework
+
+
+COMMANDS = [
+    ["FILE_UPLOAD", "Cars.txt", 200],
+    ["FILE_UPLOAD", "Foo.txt", 100],
+    ["FILE_GET", "Cars.txt"],
+    ["FILE_COPY", "Cars.txt", "Bar.txt"],
+    ["FILE_SEARCH", "Ba"],
+    ["FILE_UPLOAD_AT", 1000, "Tmp.txt", 10, 50],
+    ["FILE_GET_AT", 1049, "Tmp.txt"],
+    ["FILE_GET_AT", 1050, "Tmp.txt"],
+    ["FILE_SEARCH_AT", 1000, ""],
+    ["ROLLBACK", 999],
+    ["FILE_GET", "Cars.txt"],
+]
+
+EXPECTED = [None, None, 200, None, ["Bar.txt"], None, 10, None, ["Bar.txt", "Cars.txt", "Foo.txt", "Tmp.txt"], None, None]
+
+
+class Recorder:
+    def __init__(self):
+        self.batches = []
+
+    def add(self, a, b):
+        return a + b
+
+    def add_batch(self, args_list):
+        self.batches.append(len(args_list))
+        return [a + b for a, b in args_list]
+
+    def neg(self, a):
+        return -a
+
+
+class TestSimulator(unittest.TestCase):
+    def test_default_mode(self):
+        self.assertEqual(simulate_coding_framework(COMMANDS), EXPECTED)
+
+    def test_compiled_mode_matches_default(self):
+        compiled = make_simulator(FileStorage, compiled=True)
+        self.assertEqual(compiled(COMMANDS), EXPECTED)
+        self.assertEqual(compiled(iter(tuple(c) for c in COMMANDS)), EXPECTED)
+
+    def test_compiled_missing_commands(self):
+        commands = [["NOPE"], [], ["FILE_UPLOAD", "A", 1], ["FILE_GET", "A"]]
+        self.assertEqual(make_simulator(FileStorage, compiled=True, on_missing="skip")(commands), [None, 1])
+        with self.assertRaises(AttributeError):
+            make_simulator(FileStorage, compiled=True)(commands)
+
+    def test_batch_groups_consecutive_commands(self):
+        handlers = []
+
+        class Tracked(Recorder):
+            def __init__(self):
+                super().__init__()
+                handlers.append(self)
+
+        simulate = make_simulator(Tracked, compiled=True, batch=True)
+        commands = [["ADD", 1, 2], ["ADD", 3, 4], ["NEG", 5], ["ADD", 6, 7], ["ADD", 8, 9], ["ADD", 0, 0]]
+        self.assertEqual(simulate(commands), [3, 7, -5, 13, 17, 0])
+        self.assertEqual(handlers[0].batches, [2, 3])
+
+    def test_batch_requires_compiled(self):
+        with self.assertRaises(ValueError):
+            make_simulator(Recorder, batch=True)
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_records_per_token_stats(self):
+        instrumentation = Instrumentation()
+        simulate = make_simulator(FileStorage, instrumentation=instrumentation)
+        self.assertEqual(simulate(COMMANDS), EXPECTED)
+        stats = instrumentation.to_dict()
+        self.assertEqual(stats["FILE_UPLOAD"]["count"], 2)
+        self.assertEqual(stats["FILE_GET_AT"]["count"], 2)
+        self.assertEqual(sum(summary["count"] for summary in stats.values()), len(COMMANDS))
+        summary = stats["FILE_GET_AT"]
+        self.assertLessEqual(summary["p50_seconds"], summary["p99_seconds"])
+        self.assertLessEqual(summary["p99_seconds"], summary["max_seconds"])
+        self.assertEqual(json.loads(instrumentation.to_json()), stats)
+
+        # Stats accumulate across runs until reset
+        simulate(COMMANDS)
+        self.assertEqual(instrumentation.commands["FILE_UPLOAD"].count, 4)
+        instrumentation.reset()
+        self.assertEqual(instrumentation.to_dict(), {})
+
+    def test_percentiles_are_close_and_memory_is_bounded(self):
+        stats = CommandStats()
+        latencies = [(i % 1000 + 1) * 1e-6 for i in range(100_000)]
+        for seconds in latencies:
+            stats.record(seconds)
+        ordered = sorted(latencies)
+        for percent in (50, 95, 99, 100):
+            exact = ordered[math.ceil(percent / 100 * len(ordered)) - 1]
+            self.assertAlmostEqual(stats.percentile(percent) / exact, 1, delta=0.023)
+        self.assertEqual(stats.summary()["max_seconds"], 1e-3)
+        self.assertLess(len(stats.buckets), 200)
+
+    def test_table_is_sorted_and_allocations_are_traced(self):
+        instrumentation = Instrumentation(trace_allocations=True)
+        commands = [["FILE_UPLOAD", f"f{i}", i] for i in range(50)] + [["FILE_GET", "f1"]]
+        make_simulator(FileStorage, instrumentation=instrumentation)(commands)
+        self.assertGreater(instrumentation.commands["FILE_UPLOAD"].allocated_bytes, 0)
+        lines = instrumentation.format_table(sort_by="count").splitlines()
+        self.assertTrue(lines[2].startswith("FILE_UPLOAD"))
+        self.assertTrue(lines[3].startswith("FILE_GET"))
+        self.assertIn("alloc B", lines[0])
+
+    def test_instrumentation_rejects_batch(self):
+        with self.assertRaises(ValueError):
+            make_simulator(Recorder, compiled=True, batch=True, instrumentation=Instrumentation())
+
+
+class TestStreamingSimulator(unittest.TestCase):
+    def test_streaming_matches_eager(self):
+        for compiled in (False, True):
+            stream = make_streaming_simulator(FileStorage, compiled=compiled)
+            self.assertEqual(list(stream(COMMANDS)), EXPECTED)
+
+    def test_outputs_are_yielded_before_input_is_exhausted(self):
+        commands = itertools.chain([["FILE_UPLOAD", "A", 1]], itertools.repeat(["FILE_GET", "A"]))
+        stream = make_streaming_simulator(FileStorage, compiled=True)
+        self.assertEqual(list(itertools.islice(stream(commands), 4)), [None, 1, 1, 1])
+
+    def test_read_commands_from_jsonl_and_csv(self):
+        with tempfile.TemporaryDirectory() as directory:
+            jsonl_path = os.path.join(directory, "commands.jsonl")
+            with open(jsonl_path, "w") as handle:
+                for command in COMMANDS:
+                    handle.write(json.dumps(command) + "\n")
+                handle.write("\n")
+            csv_path = os.path.join(directory, "commands.csv")
+            with open(csv_path, "w") as handle:
+                handle.write("FILE_UPLOAD_AT,1000,a.txt,10,\nFILE_UPLOAD_AT,1000,b.txt,20,5\nFILE_SEARCH_AT,1004,b\nFILE_SEARCH_AT,1005,b\n")
+
+            stream = make_streaming_simulator(FileStorage)
+            self.assertEqual(list(stream(read_commands(jsonl_path))), EXPECTED)
+            self.assertEqual(list(read_commands(csv_path))[0], ["FILE_UPLOAD_AT", 1000, "a.txt", 10, None])
+            self.assertEqual(list(stream(read_commands(csv_path))), [None, None, ["b.txt"], []])
+
+            bad_path = os.path.join(directory, "commands.txt")
+            with open(bad_path, "w") as handle:
+                handle.write('{"command": "FILE_GET"}\n')
+            with self.assertRaises(ValueError):
+                list(read_commands(bad_path))
+            with self.assertRaises(ValueError):
+                list(read_commands(bad_path, format="jsonl"))
+
+
+if __name__ == "__main__":
+    unittest.main()
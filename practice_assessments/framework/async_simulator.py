@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterable, Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Sequence, Type, Union
+
+from framework.simulator import _make_runner
+
+
+_CLOSE = object()
+
+
+@dataclass
+class SessionStats:
+    """Per-session counters. Latency is measured from `send` to the command's result."""
+
+    commands: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+    # deepest the session's queue got; reaching max_pending means producers were throttled
+    max_queue_depth: int = 0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.commands if self.commands else 0.0
+
+
+class Session:
+    """One independent command stream with its own handler instance.
+
+    Producers `await send(command)`; once `max_pending` commands are queued, `send`
+    blocks until the session catches up, which is the backpressure signal.
+    """
+
+    def __init__(
+        self,
+        session_id: Hashable,
+        handler: Any,
+        run: Callable[..., Any],
+        max_pending: int,
+        chunk_size: int,
+        on_close: Optional[Callable[[Session], None]] = None,
+    ):
+        self.id = session_id
+        self.handler = handler
+        self.outputs: List[Any] = []
+        self.stats = SessionStats()
+        self.error: Optional[BaseException] = None
+        self._run = run
+        self._chunk_size = chunk_size
+        self._on_close = on_close
+        self._queue: asyncio.Queue = asyncio.Queue(max_pending)
+        self._task = asyncio.get_running_loop().create_task(self._serve())
+
+    async def send(self, command: Sequence[Any]) -> None:
+        if self.error is not None:
+            raise self.error
+        await self._queue.put((command, time.perf_counter()))
+        depth = self._queue.qsize()
+        if depth > self.stats.max_queue_depth:
+            self.stats.max_queue_depth = depth
+
+    async def close(self) -> List[Any]:
+        """Signal the end of the stream and wait for every queued command to finish."""
+        await self._queue.put(_CLOSE)
+        await self._task
+        if self._on_close is not None:
+            self._on_close(self)
+        if self.error is not None:
+            raise self.error
+        return self.outputs
+
+    async def _serve(self) -> None:
+        closed = False
+        while not closed:
+            items = [await self._queue.get()]
+            while len(items) < self._chunk_size and items[-1] is not _CLOSE and not self._queue.empty():
+                items.append(self._queue.get_nowait())
+            if items[-1] is _CLOSE:
+                closed = True
+                items.pop()
+            if self.error is None and items:
+                # Run the chunk synchronously, then yield so other sessions get a turn
+                try:
+                    self.outputs.extend(self._run([command for command, _ in items], self.handler))
+                except Exception as error:
+                    # Keep draining so blocked producers are released; close() re-raises
+                    self.error = error
+                finished = time.perf_counter()
+                stats = self.stats
+                for _, sent in items:
+                    latency = finished - sent
+                    stats.total_latency += latency
+                    if latency > stats.max_latency:
+                        stats.max_latency = latency
+                stats.commands += len(items)
+            await asyncio.sleep(0)
+
+
+class AsyncSimulator:
+    """Serve many independent command sessions from one asyncio event loop.
+
+    Every session gets its own handler instance and is processed in chunks of up to
+    `chunk_size` commands between yields to the loop, so a busy session cannot starve
+    the others. `max_sessions` caps how many sessions `run` keeps active at once.
+
+    `sessions` holds only open sessions; a closed session is dropped, along with its
+    handler and outputs, and only its SessionStats are kept, so a session id can be
+    reused once its earlier session has closed.
+    """
+
+    def __init__(
+        self,
+        handler_class: Type[Any],
+        token_to_method: Optional[Callable[[str], str]] = None,
+        on_missing: str = "raise",
+        max_pending: int = 1024,
+        chunk_size: int = 64,
+        max_sessions: Optional[int] = None,
+    ):
+        self.handler_class = handler_class
+        self.max_pending = max_pending
+        self.chunk_size = chunk_size
+        self.max_sessions = max_sessions
+        self.sessions: Dict[Hashable, Session] = {}
+        self._closed_stats: Dict[Hashable, SessionStats] = {}
+        self._next_id = 0
+        self._run = _make_runner(handler_class, token_to_method, on_missing, compiled=True, batch=False)
+
+    def open_session(self, session_id: Optional[Hashable] = None) -> Session:
+        """Start a session; must be called from a running event loop."""
+        if session_id is None:
+            # Skip ids the caller has already used, open or closed
+            while self._next_id in self.sessions or self._next_id in self._closed_stats:
+                self._next_id += 1
+            session_id = self._next_id
+            self._next_id += 1
+        if session_id in self.sessions:
+            raise ValueError(f"Session '{session_id}' already exists")
+        session = Session(
+            session_id, self.handler_class(), self._run, self.max_pending, self.chunk_size, self._session_closed
+        )
+        self.sessions[session_id] = session
+        return session
+
+    def _session_closed(self, session: Session) -> None:
+        del self.sessions[session.id]
+        self._closed_stats[session.id] = session.stats
+
+    async def run(
+        self, streams: Mapping[Hashable, Union[Iterable[Sequence[Any]], AsyncIterable[Sequence[Any]]]]
+    ) -> Dict[Hashable, Union[List[Any], BaseException]]:
+        """Feed every stream to its own session and return the outputs keyed like `streams`.
+
+        A session that fails does not stop the others: its entry holds the exception
+        instead of a list of outputs.
+        """
+        limit = asyncio.Semaphore(self.max_sessions) if self.max_sessions else None
+
+        async def feed(session_id: Hashable, commands: Any) -> List[Any]:
+            if limit is not None:
+                await limit.acquire()
+            try:
+                session = self.open_session(session_id)
+                try:
+                    if hasattr(commands, "__aiter__"):
+                        async for command in commands:
+                            await session.send(command)
+                    else:
+                        for command in commands:
+                            await session.send(command)
+                finally:
+                    # Always close, so the session is dropped and its serve task ends;
+                    # close re-raises the session's error
+                    outputs = await session.close()
+                return outputs
+            finally:
+                if limit is not None:
+                    limit.release()
+
+        results = await asyncio.gather(
+            *(feed(session_id, commands) for session_id, commands in streams.items()), return_exceptions=True
+        )
+        return dict(zip(streams.keys(), results))
+
+    def stats(self) -> Dict[Hashable, SessionStats]:
+        """Stats of every session by id; for a reused id, those of its latest session."""
+        stats = dict(self._closed_stats)
+        stats.update((session_id, session.stats) for session_id, session in self.sessions.items())
+        return stats
+
+
+def make_async_simulator(
+    handler_class: Type[Any],
+    token_to_method: Optional[Callable[[str], str]] = None,
+    on_missing: str = "raise",
+    max_pending: int = 1024,
+    chunk_size: int = 64,
+    max_sessions: Optional[int] = None,
+) -> AsyncSimulator:
+    """Create an AsyncSimulator; the asyncio counterpart of make_simulator.
+
+        simulator = make_async_simulator(FileStorage)
+        outputs = asyncio.run(simulator.run({"tenant-a": commands_a, "tenant-b": commands_b}))
+    """
+    return AsyncSimulator(handler_class, token_to_method, on_missing, max_pending, chunk_size, max_sessions)
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import json
+import math
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Dict
+
+
+# Latency histogram resolution: buckets per doubling. A percentile is reported as the
+# geometric middle of its bucket, so it is within 2 ** (1 / (2 * _BUCKETS_PER_OCTAVE)) - 1
+# (about 2.2%) of the exact nearest-rank value.
+_BUCKETS_PER_OCTAVE = 16
+# Latencies are clamped to at least this before bucketing (a timer can report 0)
+_MIN_SECONDS = 1e-9
+
+
+@dataclass
+class CommandStats:
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    # log-bucketed latency histogram, bucket index -> calls; a few hundred buckets at most
+    # cover nanoseconds to minutes, so memory stays constant however many calls are made
+    buckets: Dict[int, int] = field(default_factory=dict)
+    # net bytes still allocated after the calls, and the largest transient peak of one call
+    allocated_bytes: int = 0
+    peak_bytes: int = 0
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+        bucket = math.floor(math.log2(max(seconds, _MIN_SECONDS)) * _BUCKETS_PER_OCTAVE)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def percentile(self, percent: float) -> float:
+        """Nearest-rank percentile of the call latencies in seconds, to within about 2.2%."""
+        if not self.buckets:
+            return 0.0
+        rank = max(1, math.ceil(percent / 100 * sum(self.buckets.values())))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                break
+        return min(2 ** ((bucket + 0.5) / _BUCKETS_PER_OCTAVE), self.max_seconds)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_seconds": self.total_seconds,
+            "mean_seconds": self.total_seconds / self.count if self.count else 0.0,
+            "p50_seconds": self.percentile(50),
+            "p95_seconds": self.percentile(95),
+            "p99_seconds": self.percentile(99),
+            "max_seconds": self.max_seconds,
+            "allocated_bytes": self.allocated_bytes,
+            "peak_bytes": self.peak_bytes,
+        }
+
+
+class Instrumentation:
+    """Per-token call counts, latency percentiles and (optionally) allocations.
+
+    Pass an instance to make_simulator/make_streaming_simulator; stats accumulate across
+    runs until `reset`. With trace_allocations=True each call is bracketed by tracemalloc
+    snapshots, which is accurate but slows every command down considerably.
+    """
+
+    def __init__(self, trace_allocations: bool = False):
+        self.trace_allocations = trace_allocations
+        self.commands: Dict[str, CommandStats] = {}
+
+    def reset(self) -> None:
+        self.commands = {}
+
+    def stats_for(self, token: Any) -> CommandStats:
+        key = str(token)
+        stats = self.commands.get(key)
+        if stats is None:
+            stats = self.commands[key] = CommandStats()
+        return stats
+
+    def start(self) -> bool:
+        """Begin allocation tracing if requested; returns whether the caller must stop it."""
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            return True
+        return False
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {token: stats.summary() for token, stats in self.commands.items()}
+
+    def to_json(self, indent: int = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def format_table(self, sort_by: str = "total_seconds") -> str:
+        """Render the stats as a text table, most expensive first by the given summary column."""
+        rows = sorted(self.to_dict().items(), key=lambda row: row[1][sort_by], reverse=True)
+        width = max([len("command")] + [len(token) for token, _ in rows])
+        header = f"{'command':<{width}}  {'count':>9}  {'total ms':>10}  {'p50 us':>9}  {'p95 us':>9}  {'p99 us':>9}"
+        if self.trace_allocations:
+            header += f"  {'alloc B':>10}  {'peak B':>9}"
+        lines = [header, "-" * len(header)]
+        for token, summary in rows:
+            line = (
+                f"{token:<{width}}  {summary['count']:>9}  {summary['total_seconds'] * 1e3:>10.2f}"
+                f"  {summary['p50_seconds'] * 1e6:>9.1f}  {summary['p95_seconds'] * 1e6:>9.1f}"
+                f"  {summary['p99_seconds'] * 1e6:>9.1f}"
+            )
+            if self.trace_allocations:
+                line += f"  {summary['allocated_bytes']:>10}  {summary['peak_bytes']:>9}"
+            lines.append(line)
+        return "\n".join(lines)
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple, Type
+
+from framework.simulator import _make_runner
+
+
+def _pack(commands: Iterable[Sequence[Any]]) -> List[Tuple[Any, ...]]:
+    """Turn a session into tuples with interned string tokens.
+
+    Pickle memoises objects by identity, so interning means each distinct token is
+    written once per shard instead of once per command.
+    """
+    packed = []
+    for command in commands:
+        if not command:
+            continue
+        token = command[0]
+        if type(token) is str:
+            token = sys.intern(token)
+        packed.append((token, *command[1:]))
+    return packed
+
+
+def _run_shard(
+    handler_class: Type[Any],
+    token_to_method: Optional[Callable[[str], str]],
+    on_missing: str,
+    sessions: List[List[Tuple[Any, ...]]],
+) -> List[List[Any]]:
+    run = _make_runner(handler_class, token_to_method, on_missing, compiled=True, batch=False)
+    return [list(run(commands)) for commands in sessions]
+
+
+def make_parallel_simulator(
+    handler_class: Type[Any],
+    workers: Optional[int] = None,
+    token_to_method: Optional[Callable[[str], str]] = None,
+    on_missing: str = "raise",
+    shards_per_worker: int = 4,
+) -> Callable[[Iterable[Iterable[Sequence[Any]]]], List[List[Any]]]:
+    """Create a simulator that runs independent sessions across a process pool.
+
+    - workers: number of processes; defaults to os.cpu_count(). With 1 worker the sessions
+      run in this process and nothing is pickled.
+    - shards_per_worker: sessions are grouped into about workers * shards_per_worker shards,
+      each shipped as one task, so per-task overhead is paid per shard rather than per session.
+
+    Returns a function simulate_sessions(sessions) -> List[List[Any]] giving each session's
+    outputs in input order. Every session gets its own handler instance. handler_class and
+    token_to_method must be picklable, i.e. defined at module level.
+    """
+
+    worker_count = workers or os.cpu_count() or 1
+
+    def simulate_sessions(sessions: Iterable[Iterable[Sequence[Any]]]) -> List[List[Any]]:
+        packed = [_pack(commands) for commands in sessions]
+        if worker_count == 1 or len(packed) <= 1:
+            return _run_shard(handler_class, token_to_method, on_missing, packed)
+        shard_count = min(len(packed), worker_count * shards_per_worker)
+        shard_size = -(-len(packed) // shard_count)
+        shards = [packed[i:i + shard_size] for i in range(0, len(packed), shard_size)]
+        run_shard = partial(_run_shard, handler_class, token_to_method, on_missing)
+        outputs: List[List[Any]] = []
+        with ProcessPoolExecutor(max_workers=worker_count) as pool:
+            for shard_outputs in pool.map(run_shard, shards):
+                outputs.extend(shard_outputs)
+        return outputs
+
+    return simulate_sessions
@@ -1,6 +1,13 @@
 from __future__ import annotations
 
-from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Type
+import csv
+import json
+import os
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type
+
+from framework.instrumentation import Instrumentation
 
 
 def _default_token_to_method(token: str) -> str:
@@ -8,42 +15,237 @@ def _default_token_to_method(token: str) -> str:
     return token.lower()
 
 
+def _call(method: Callable[..., Any], command: Sequence[Any]) -> Any:
+    """Call `method` with command[1:] as arguments without slicing for the common arities."""
+    arity = len(command)
+    if arity == 2:
+        return method(command[1])
+    if arity == 3:
+        return method(command[1], command[2])
+    if arity == 4:
+        return method(command[1], command[2], command[3])
+    if arity == 5:
+        return method(command[1], command[2], command[3], command[4])
+    if arity == 1:
+        return method()
+    return method(*command[1:])
+
+
+def _make_runner(
+    handler_class: Type[Any],
+    token_to_method: Optional[Callable[[str], str]],
+    on_missing: str,
+    compiled: bool,
+    batch: bool,
+    instrumentation: Optional[Instrumentation] = None,
+) -> Callable[[Iterable[Sequence[Any]]], Iterator[Any]]:
+    """Build the generator function shared by the eager, streaming and async simulators.
+
+    The generator instantiates a fresh handler unless one is passed in, which lets a
+    caller feed one long-lived handler in several chunks.
+    """
+
+    token_mapper = token_to_method or _default_token_to_method
+
+    def run(list_of_lists: Iterable[Sequence[Any]], handler: Any = None) -> Iterator[Any]:
+        if handler is None:
+            handler = handler_class()
+        for command in list_of_lists:
+            if not command:
+                continue
+            token = str(command[0])
+            args = list(command[1:])
+            method_name = token_mapper(token)
+            method = getattr(handler, method_name, None)
+            if method is None:
+                if on_missing == "skip":
+                    continue
+                raise AttributeError(f"Unknown command '{token}' mapped to missing method '{method_name}'")
+            yield method(*args)
+
+    def resolve(handler: Any, token: Any) -> Optional[Tuple[Callable[..., Any], Optional[Callable[..., Any]]]]:
+        method_name = token_mapper(str(token))
+        method = getattr(handler, method_name, None)
+        if method is None:
+            if on_missing == "skip":
+                return None
+            raise AttributeError(f"Unknown command '{token}' mapped to missing method '{method_name}'")
+        batch_method = getattr(handler, f"{method_name}_batch", None) if batch else None
+        return method, batch_method
+
+    def run_compiled(list_of_lists: Iterable[Sequence[Any]], handler: Any = None) -> Iterator[Any]:
+        if handler is None:
+            handler = handler_class()
+        # token -> (bound method, bound batch method or None), or None for skipped tokens
+        table: Dict[Any, Any] = {}
+        pending_batch: Optional[Callable[..., Any]] = None
+        pending_args: List[Sequence[Any]] = []
+        for command in list_of_lists:
+            if not command:
+                continue
+            token = command[0]
+            try:
+                entry = table[token]
+            except KeyError:
+                entry = table[token] = resolve(handler, token)
+            if entry is None:
+                continue
+            method, batch_method = entry
+            if pending_batch is not None and batch_method is not pending_batch:
+                yield from pending_batch(pending_args)
+                pending_batch = None
+                pending_args = []
+            if batch_method is not None:
+                pending_batch = batch_method
+                pending_args.append(command[1:])
+                continue
+            yield _call(method, command)
+        if pending_batch is not None:
+            yield from pending_batch(pending_args)
+
+    def run_instrumented(list_of_lists: Iterable[Sequence[Any]], handler: Any = None) -> Iterator[Any]:
+        if handler is None:
+            handler = handler_class()
+        # token -> (bound method, CommandStats), or None for skipped tokens
+        table: Dict[Any, Any] = {}
+        trace = instrumentation.trace_allocations
+        perf_counter = time.perf_counter
+        stop_tracing = instrumentation.start()
+        try:
+            for command in list_of_lists:
+                if not command:
+                    continue
+                token = command[0]
+                try:
+                    entry = table[token]
+                except KeyError:
+                    resolved = resolve(handler, token)
+                    entry = table[token] = None if resolved is None else (resolved[0], instrumentation.stats_for(token))
+                if entry is None:
+                    continue
+                method, stats = entry
+                if trace:
+                    tracemalloc.reset_peak()
+                    before, _ = tracemalloc.get_traced_memory()
+                start = perf_counter()
+                result = _call(method, command)
+                elapsed = perf_counter() - start
+                if trace:
+                    after, peak = tracemalloc.get_traced_memory()
+                    stats.allocated_bytes += after - before
+                    if peak - before > stats.peak_bytes:
+                        stats.peak_bytes = peak - before
+                stats.record(elapsed)
+                yield result
+        finally:
+            if stop_tracing:
+                tracemalloc.stop()
+
+    if batch and not compiled:
+        raise ValueError("batch=True requires compiled=True")
+    if instrumentation is not None:
+        if batch:
+            raise ValueError("instrumentation times commands one by one and cannot be combined with batch=True")
+        return run_instrumented
+    if compiled:
+        return run_compiled
+    return run
+
+
 def make_simulator(
     handler_class: Type[Any],
     token_to_method: Optional[Callable[[str], str]] = None,
     on_missing: str = "raise",
+    compiled: bool = False,
+    batch: bool = False,
+    instrumentation: Optional[Instrumentation] = None,
 ) -> Callable[[Iterable[Sequence[Any]]], List[Any]]:
     """Create a simulator function for a given handler class.
 
     - handler_class: class with methods matching command tokens (e.g., file_upload, file_get,...)
     - token_to_method: optional function to map tokens to method names; defaults to lowercase
     - on_missing: 'raise' to error on unknown command; 'skip' to ignore
+    - compiled: resolve each distinct token to a bound method once per run and call it without
+      building an argument list per command; outputs are identical to the default mode
+    - batch: with compiled, hand runs of consecutive commands with the same token to the
+      handler's '<method>_batch' method when it has one. It receives a list of argument tuples
+      and must return one result per tuple.
+    - instrumentation: optional Instrumentation that records per-token call counts, latency
+      percentiles and, if enabled, allocations. Dispatch is compiled-style; when omitted the
+      run pays nothing for it.
 
     Returns a function with signature: simulate_coding_framework(list_of_lists) -> List[Any]
     Each command is a sequence like ["FILE_UPLOAD", name, size]. The simulator dispatches to
     handler.method(*args) and appends the return value to the outputs list.
     """
 
-    token_mapper = token_to_method or _default_token_to_method
+    run = _make_runner(handler_class, token_to_method, on_missing, compiled, batch, instrumentation)
 
     def simulate_coding_framework(list_of_lists: Iterable[Sequence[Any]]) -> List[Any]:
-        handler = handler_class()
-        outputs: List[Any] = []
-        for command in list_of_lists:
-            if not command:
-                continue
-            token = str(command[0])
-            args = list(command[1:])
-            method_name = token_mapper(token)
-            method = getattr(handler, method_name, None)
-            if method is None:
-                if on_missing == "skip":
-                    continue
-                raise AttributeError(f"Unknown command '{token}' mapped to missing method '{method_name}'")
-            result = method(*args)
-            outputs.append(result)
-        return outputs
+        return list(run(list_of_lists))
 
     return simulate_coding_framework
 
 
+def make_streaming_simulator(
+    handler_class: Type[Any],
+    token_to_method: Optional[Callable[[str], str]] = None,
+    on_missing: str = "raise",
+    compiled: bool = False,
+    batch: bool = False,
+    instrumentation: Optional[Instrumentation] = None,
+) -> Callable[[Iterable[Sequence[Any]]], Iterator[Any]]:
+    """Like make_simulator, but the returned function is a generator.
+
+    Commands are pulled from the iterable one at a time and each result is yielded as soon
+    as it is produced, so memory does not grow with the length of the command stream.
+    With batch=True a batched run is yielded once the run ends. Pair it with
+    read_commands to stream a command log from disk:
+
+        stream = make_streaming_simulator(FileStorage)
+        for output in stream(read_commands("commands.jsonl")):
+            ...
+    """
+
+    return _make_runner(handler_class, token_to_method, on_missing, compiled, batch, instrumentation)
+
+
+def _parse_csv_field(field: str) -> Any:
+    if field == "":
+        return None
+    try:
+        return int(field)
+    except ValueError:
+        return field
+
+
+def read_commands(path: str, format: Optional[str] = None) -> Iterator[List[Any]]:
+    """Lazily read commands from a JSON Lines or CSV file.
+
+    - format: 'jsonl' or 'csv'; inferred from the file extension when omitted
+      ('.jsonl'/'.ndjson' or '.csv').
+
+    JSONL: one JSON array per line, e.g. ["FILE_UPLOAD_AT", 1000, "a.txt", 10, null]; blank
+    lines are skipped. CSV: one command per row; since CSV has no types, integer-looking
+    fields become ints and empty fields become None.
+    """
+    if format is None:
+        extension = os.path.splitext(path)[1].lower()
+        format = {".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv"}.get(extension)
+        if format is None:
+            raise ValueError(f"Cannot infer command file format from '{path}'; pass format='jsonl' or 'csv'")
+    with open(path, newline="") as handle:
+        if format == "jsonl":
+            for line_number, line in enumerate(handle, 1):
+                if not line.strip():
+                    continue
+                command = json.loads(line)
+                if not isinstance(command, list):
+                    raise ValueError(f"{path}:{line_number}: expected a JSON array, got {type(command).__name__}")
+                yield command
+        elif format == "csv":
+            for row in csv.reader(handle):
+                if row:
+                    yield [row[0]] + [_parse_csv_field(field) for field in row[1:]]
+        else:
+            raise ValueError(f"Unknown command file format '{format}'")
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
 from dataclasses import dataclass, field
 from enum import Enum, IntEnum
 from copy import deepcopy
-from graphlib import TopologicalSorter, CycleError
-from datetime import date
+from datetime import date, timedelta
+from itertools import islice
+from typing import Callable, Iterator
+
+import numpy as np
+from sortedcontainers import SortedList, SortedSet
 
 
 class TaskStatus(Enum):
@@ -34,6 +40,65 @@ class Task:
     priority: TaskPriority = TaskPriority.MEDIUM
     assignee_id: int | None = None
     due_date: date | None = None
+    project_id: int | None = None
+    estimated_hours: float | None = None
+    tags: set[str] = field(default_factory=set)
+
+
+class TaskView:
+    """Read-only view of a task held by a TaskManager.
+
+    Queries hand these out instead of copies. A view reads through to the live task, so it
+    reflects later changes; lists and sets come back as tuples and frozensets, and assignment
+    raises. Call `copy()` (or pass copy=True to the query) for an owned, mutable Task;
+    `copy.deepcopy(view)` does the same, and a pickled view unpickles onto its own Task copy.
+    """
+
+    __slots__ = ("_task",)
+
+    def __init__(self, task: Task):
+        object.__setattr__(self, "_task", task)
+
+    def __getattr__(self, name: str):
+        # Copy and unpickle probe dunders on an instance whose slot is not set yet; looking
+        # those up on the task would recurse through self._task forever
+        if name == "_task" or (name.startswith("__") and name.endswith("__")):
+            raise AttributeError(name)
+        value = getattr(self._task, name)
+        if isinstance(value, list):
+            return tuple(value)
+        if isinstance(value, set):
+            return frozenset(value)
+        return value
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError(f"TaskView is read-only; cannot set {name!r}")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"TaskView is read-only; cannot delete {name!r}")
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, TaskView):
+            other = other._task
+        return self._task == other
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"TaskView({self._task!r})"
+
+    def __reduce__(self):
+        return (TaskView, (self._task,))
+
+    def __copy__(self) -> TaskView:
+        # Views are immutable, so a shallow copy can share this one
+        return self
+
+    def __deepcopy__(self, memo: dict) -> Task:
+        return deepcopy(self._task, memo)
+
+    def copy(self) -> Task:
+        return deepcopy(self._task)
 
 
 @dataclass
@@ -43,12 +108,324 @@ class User:
     id: int
 
 
+@dataclass
+class Project:
+    name: str
+    description: str
+    owner_id: int
+    id: int
+    created_date: date | None = None
+
+
+@dataclass
+class TaskTemplate:
+    name: str
+    title_template: str
+    description_template: str
+    default_priority: TaskPriority
+    id: int
+    estimated_hours: float | None = None
+
+
+@dataclass
+class TimeEntry:
+    task_id: int
+    user_id: int
+    hours: float
+    date: date
+    description: str
+
+
+def _grams(text: str) -> set[str]:
+    # Overlapping 3-character slices; any substring of 3+ characters contains at least one
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+# Spacing of the order labels handed to new tasks; the gaps leave room to move tasks
+# between neighbours without relabelling
+_ORDER_GAP = 1 << 32
+
+# Postings longer than this move from a plain sorted list to a SortedList
+_SHORT_POSTING = 64
+
+
+def _post(postings: dict, key, task_id: int) -> None:
+    # Short postings (most exact titles, rare grams) stay plain lists to save memory; common
+    # grams hold most of the board, where list deletes would shift every later id
+    ids = postings.get(key)
+    if ids is None:
+        postings[key] = [task_id]
+    elif type(ids) is list:
+        insort(ids, task_id)
+        if len(ids) > _SHORT_POSTING:
+            postings[key] = SortedList(ids)
+    else:
+        ids.add(task_id)
+
+
+def _unpost(postings: dict, key, task_id: int) -> None:
+    ids = postings[key]
+    if type(ids) is list:
+        del ids[bisect_left(ids, task_id)]
+    else:
+        ids.remove(task_id)
+    if not ids:
+        del postings[key]
+
+
+class _IdSet:
+    """Sorted int64 array of task ids with buffered inserts and deletes.
+
+    Writes land in two small Python sets and are merged into the array on the next read,
+    so tagging many tasks in a row does not copy the array once per task.
+    """
+
+    __slots__ = ("ids", "added", "removed")
+
+    def __init__(self):
+        self.ids = np.empty(0, dtype=np.int64)
+        self.added = set()
+        self.removed = set()
+
+    def add(self, task_id: int) -> None:
+        self.removed.discard(task_id)
+        self.added.add(task_id)
+
+    def discard(self, task_id: int) -> None:
+        self.added.discard(task_id)
+        self.removed.add(task_id)
+
+    def array(self) -> np.ndarray:
+        if self.added:
+            self.ids = np.union1d(self.ids, np.fromiter(self.added, dtype=np.int64, count=len(self.added)))
+            self.added.clear()
+        if self.removed:
+            removed = np.fromiter(self.removed, dtype=np.int64, count=len(self.removed))
+            self.ids = np.setdiff1d(self.ids, removed, assume_unique=True)
+            self.removed.clear()
+        return self.ids
+
+
+class _TimeEntryColumns:
+    """Time entries stored column-wise in NumPy arrays that grow by doubling.
+
+    Dates are kept as ordinals so date-window filters are plain integer comparisons.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.size = 0
+        self.task_ids = np.empty(capacity, dtype=np.int64)
+        self.user_ids = np.empty(capacity, dtype=np.int64)
+        self.days = np.empty(capacity, dtype=np.int64)
+        self.hours = np.empty(capacity, dtype=np.float64)
+        self.descriptions = []
+
+    def append(self, task_id: int, user_id: int, day: date, hours: float, description: str) -> None:
+        if self.size == len(self.hours):
+            for name in ("task_ids", "user_ids", "days", "hours"):
+                column = getattr(self, name)
+                grown = np.empty(2 * len(column), dtype=column.dtype)
+                grown[:self.size] = column
+                setattr(self, name, grown)
+        row = self.size
+        self.task_ids[row] = task_id
+        self.user_ids[row] = user_id
+        self.days[row] = day.toordinal()
+        self.hours[row] = hours
+        self.descriptions.append(description)
+        self.size += 1
+
+    def window(self, start: date | None, end: date | None) -> np.ndarray:
+        """Boolean mask of the entries dated within [start, end]; either bound may be open."""
+        days = self.days[:self.size]
+        mask = np.ones(self.size, dtype=bool)
+        if start is not None:
+            mask &= days >= start.toordinal()
+        if end is not None:
+            mask &= days <= end.toordinal()
+        return mask
+
+    def entries(self, mask: np.ndarray) -> list[TimeEntry]:
+        """The masked entries, newest date first and in insertion order within a date."""
+        rows = np.flatnonzero(mask)
+        rows = rows[np.argsort(-self.days[rows], kind="stable")]
+        return [
+            TimeEntry(
+                task_id=int(self.task_ids[row]),
+                user_id=int(self.user_ids[row]),
+                hours=float(self.hours[row]),
+                date=date.fromordinal(int(self.days[row])),
+                description=self.descriptions[row],
+            )
+            for row in rows
+        ]
+
+
 class TaskManager:
-    def __init__(self) -> None:
+    def __init__(self, clock: Callable[[], date] = date.today) -> None:
+        # Source of "today" for overdue and due-soon queries; injectable for tests and benchmarks
+        self.clock = clock
         # id -> Task
         self.tasks = {}
         # id -> User
         self.users = {}
+        # id -> Project
+        self.projects = {}
+        # id -> TaskTemplate
+        self.templates = {}
+        # id -> ids of the tasks that depend on it (reverse of Task.dependencies)
+        self._dependents = {}
+        # id -> label in a topological order of the dependency graph (dependencies come first);
+        # the order is also linked both ways, with None as the sentinel before the first task
+        # and after the last, so tasks can be moved between neighbours
+        self._position = {}
+        self._order_prev = {None: None}
+        self._order_next = {None: None}
+        self._next_id = 1
+        # id -> number of dependencies that are not DONE
+        self._unfinished = {}
+        # (priority, id) of TODO tasks with every dependency DONE
+        self._ready = SortedList()
+        self._ready_keys = {}
+        # ids of TODO/BLOCKED tasks with an unfinished dependency
+        self._blocked = SortedSet()
+        # ids whose status auto_update_blocked_status would change
+        self._status_pending = set()
+        # status -> ids, priority -> ids, user id -> (due date, priority, id) keys
+        self._by_status = defaultdict(SortedSet)
+        self._by_priority = defaultdict(SortedSet)
+        self._by_assignee = defaultdict(SortedList)
+        # user id -> Counter of the statuses of their tasks
+        self._user_status_counts = defaultdict(Counter)
+        # (due date, id) of every task with a due date that is not DONE
+        self._by_due = SortedList()
+        # project id -> (priority, due date, id) keys, and a Counter of their statuses
+        self._by_project = defaultdict(SortedList)
+        self._project_status_counts = defaultdict(Counter)
+        # id -> (status, priority, assignee_id, assignee key, due key, project_id, project key)
+        # the task is filed under
+        self._filed = {}
+        # id -> the one TaskView handed out for it; views read through, so they never go stale
+        self._views = {}
+        # id -> (lowercased title, lowercased description) as indexed for search
+        self._search_text = {}
+        # lowercased title -> ids, and trigram -> ids over titles and over descriptions
+        self._exact_titles = {}
+        self._title_grams = {}
+        self._description_grams = {}
+        # tag -> _IdSet of the tasks carrying it
+        self._by_tag = defaultdict(_IdSet)
+        self._time_entries = _TimeEntryColumns()
+        # task id -> hours logged against it
+        self._task_hours = defaultdict(float)
+        # id -> date the task last became DONE
+        self._completed_on = {}
+
+    def _insert_task(self, task: Task) -> None:
+        self.tasks[task.id] = task
+        self._views[task.id] = TaskView(task)
+        self._next_id = task.id + 1
+        self._dependents[task.id] = set()
+        # A new task has no edges yet, so the end of the order is always valid
+        last = self._order_prev[None]
+        self._position[task.id] = self._position[last] + _ORDER_GAP if last is not None else 0
+        self._link(task.id, last, None)
+        self._unfinished[task.id] = 0
+        self._reindex(task)
+        self._index_text(task)
+
+    def _reindex(self, task: Task) -> None:
+        self._track_indexes(task)
+        self._track_readiness(task)
+
+    def _track_indexes(self, task: Task) -> None:
+        # Re-file one task in the secondary indexes, touching only the entries whose key moved
+        unfiled = (None,) * 7
+        old = self._filed.pop(task.id, unfiled)
+        new = unfiled
+        if task.id in self.tasks:
+            assignee_key = due_key = project_key = None
+            # Tasks without a due date sort after those with one
+            due_order = (task.due_date is None, task.due_date or date.max)
+            if task.assignee_id is not None:
+                assignee_key = (*due_order, task.priority, task.id)
+            if task.due_date is not None and task.status != TaskStatus.DONE:
+                due_key = (task.due_date, task.id)
+            if task.project_id is not None:
+                project_key = (task.priority, *due_order, task.id)
+            new = self._filed[task.id] = (
+                task.status, task.priority, task.assignee_id, assignee_key, due_key, task.project_id, project_key
+            )
+        old_status, old_priority, old_assignee_id, old_assignee_key, old_due_key, old_project_id, old_project_key = old
+        status, priority, assignee_id, assignee_key, due_key, project_id, project_key = new
+        if old_status != status:
+            if old_status is not None:
+                self._by_status[old_status].remove(task.id)
+            if status is not None:
+                self._by_status[status].add(task.id)
+        if old_priority != priority:
+            if old_priority is not None:
+                self._by_priority[old_priority].remove(task.id)
+            if priority is not None:
+                self._by_priority[priority].add(task.id)
+        if (old_assignee_id, old_assignee_key) != (assignee_id, assignee_key):
+            if old_assignee_key is not None:
+                self._by_assignee[old_assignee_id].remove(old_assignee_key)
+            if assignee_key is not None:
+                self._by_assignee[assignee_id].add(assignee_key)
+        if (old_assignee_id, old_status) != (assignee_id, status):
+            if old_assignee_id is not None:
+                self._user_status_counts[old_assignee_id][old_status] -= 1
+            if assignee_id is not None:
+                self._user_status_counts[assignee_id][status] += 1
+        if old_due_key != due_key:
+            if old_due_key is not None:
+                self._by_due.remove(old_due_key)
+            if due_key is not None:
+                self._by_due.add(due_key)
+        if (old_project_id, old_project_key) != (project_id, project_key):
+            if old_project_key is not None:
+                self._by_project[old_project_id].remove(old_project_key)
+            if project_key is not None:
+                self._by_project[project_id].add(project_key)
+        if (old_project_id, old_status) != (project_id, status):
+            if old_project_id is not None:
+                self._project_status_counts[old_project_id][old_status] -= 1
+            if project_id is not None:
+                self._project_status_counts[project_id][status] += 1
+
+    def _track_readiness(self, task: Task) -> None:
+        # Re-file one task in the readiness indexes after its status, priority or count changed
+        key = self._ready_keys.pop(task.id, None)
+        if key is not None:
+            self._ready.remove(key)
+        self._blocked.discard(task.id)
+        self._status_pending.discard(task.id)
+        if task.id not in self.tasks:
+            return
+        unfinished = self._unfinished[task.id]
+        if unfinished and task.status in (TaskStatus.TODO, TaskStatus.BLOCKED):
+            self._blocked.add(task.id)
+        elif not unfinished and task.status == TaskStatus.TODO:
+            key = (task.priority, task.id)
+            self._ready.add(key)
+            self._ready_keys[task.id] = key
+        if (task.status == TaskStatus.TODO and unfinished) or (task.status == TaskStatus.BLOCKED and not unfinished):
+            self._status_pending.add(task.id)
+
+    def _set_status(self, task: Task, status: TaskStatus) -> None:
+        was_done = task.status == TaskStatus.DONE
+        task.status = status
+        if was_done != (status == TaskStatus.DONE):
+            change = -1 if status == TaskStatus.DONE else 1
+            for dependent in self._dependents[task.id]:
+                self._unfinished[dependent] += change
+                self._track_readiness(self.tasks[dependent])
+            if status == TaskStatus.DONE:
+                self._completed_on[task.id] = self.clock()
+            else:
+                del self._completed_on[task.id]
+        self._reindex(task)
 
     ###
     # BASIC TASK MANAGEMENT
@@ -57,28 +434,52 @@ class TaskManager:
     def create_task(self, title: str, description: str) -> int:
         if not title:
             raise ValueError("Title cannot be empty.")
-        id = len(self.tasks) + 1
-        self.tasks[id] = Task(title=title, description=description, id=id, status=TaskStatus.TODO)
+        id = self._next_id
+        self._insert_task(
+            Task(title=title, description=description, id=id, status=TaskStatus.TODO, created_date=self.clock())
+        )
         return id
 
-    def get_task(self, task_id: str) -> int:
+    def _results(self, task_ids, copy: bool) -> list:
+        if copy:
+            tasks = self.tasks
+            return [deepcopy(tasks[task_id]) for task_id in task_ids]
+        views = self._views
+        return [views[task_id] for task_id in task_ids]
+
+    def get_task(self, task_id: str, copy: bool = False) -> TaskView | Task | None:
         if not task_id in self.tasks:
             return None
-        return self.tasks[task_id]
+        return deepcopy(self.tasks[task_id]) if copy else self._views[task_id]
 
-    def get_all_tasks(self):
-        task_list = []
-        for task in self.tasks.items():
-            task_list.append(deepcopy(task[1]))
-        return task_list
+    def get_all_tasks(self, copy: bool = False):
+        if not copy:
+            return list(self._views.values())
+        return self._results(self.tasks, copy)
 
     def delete_task(self, task_id: int):
         if not task_id in self.tasks:
             return False
-        del self.tasks[task_id]
-        for task in self.tasks.items():
-            if task[1].dependencies:
-                task[1].dependencies.remove(task_id)
+        task = self.tasks.pop(task_id)
+        for dependency in task.dependencies:
+            self._dependents[dependency].discard(task_id)
+        # Only the tasks that depend on this one hold references to it
+        for dependent in self._dependents.pop(task_id):
+            self.tasks[dependent].dependencies.remove(task_id)
+            if task.status != TaskStatus.DONE:
+                self._unfinished[dependent] -= 1
+                self._track_readiness(self.tasks[dependent])
+        self._unlink(task_id)
+        del self._position[task_id]
+        del self._unfinished[task_id]
+        del self._views[task_id]
+        self._reindex(task)
+        self._unindex_text(task_id)
+        for tag in task.tags:
+            self._by_tag[tag].discard(task_id)
+        # Logged entries stay in the user's history; only the task-level views go away
+        self._task_hours.pop(task_id, None)
+        self._completed_on.pop(task_id, None)
         return True
 
     def assign_task(self, task_id: int, user_id: int) -> bool:
@@ -87,12 +488,14 @@ class TaskManager:
         if self.tasks[task_id].status == TaskStatus.DONE:
             return False
         self.tasks[task_id].assignee_id = user_id
+        self._track_indexes(self.tasks[task_id])
         return True
 
     def unassign_task(self, task_id: int) -> bool:
         if not task_id in self.tasks:
             return False
         self.tasks[task_id].assignee_id = None
+        self._track_indexes(self.tasks[task_id])
         return True
 
     ###
@@ -102,83 +505,47 @@ class TaskManager:
     def update_task_status(self, task_id: int, status: str) -> bool:
         if not task_id in self.tasks:
             return False
-        self.tasks[task_id].status = status
+        self._set_status(self.tasks[task_id], status)
         return True
 
-    def get_tasks_by_status(self, status: str):
-        tasks_with_status = []
-        for task in self.tasks.items():
-            if task[1].status == status:
-                tasks_with_status.append(deepcopy(task[1]))
-        return tasks_with_status
-
-    def get_available_tasks(self) -> list[Task]:
-        available_tasks = []
-        for task in self.tasks.items():
-            if task[1].status == TaskStatus.TODO:
-                if task[1].dependencies:
-                    dependencies_done = True
-                    for dependency in task[1].dependencies:
-                        if self.tasks[dependency].status != TaskStatus.DONE: 
-                            dependencies_done = False
-                            break
-                    if dependencies_done:
-                        available_tasks.append(deepcopy(task[1]))
-                else:
-                    available_tasks.append(deepcopy(task[1]))
-        available_tasks = sorted(available_tasks, key= lambda task: (task.priority, task.id))
-        return available_tasks
-
-    def get_blocked_tasks(self) -> list[Task]:
-        blocked_tasks = []
-        for task in self.tasks.items():
-            if task[1].status in (TaskStatus.TODO, TaskStatus.BLOCKED) and task[1].dependencies:
-                for dependency in task[1].dependencies:
-                    if self.tasks[dependency].status != TaskStatus.DONE: 
-                        dependencies_done = False
-                        blocked_tasks.append(deepcopy(task[1]))
-        blocked_tasks = sorted(blocked_tasks, key= lambda task: task.id)
-        return blocked_tasks
+    def bulk_update_task_status(self, task_ids: list[int], status: str) -> int:
+        updated = 0
+        for task_id in task_ids:
+            if self.update_task_status(task_id, status):
+                updated += 1
+        return updated
+
+    def get_tasks_by_status(self, status: str, copy: bool = False):
+        return self._results(self._by_status.get(status, ()), copy)
+
+    def get_available_tasks(self, copy: bool = False) -> list[TaskView]:
+        return self._results([task_id for _, task_id in self._ready], copy)
+
+    def get_blocked_tasks(self, copy: bool = False) -> list[TaskView]:
+        return self._results(self._blocked, copy)
 
     def auto_update_blocked_status(self) -> int:
-        status_changed = 0
-        for task in self.tasks.items():
-            if not task[1].dependencies:
-                continue
-            if task[1].status == TaskStatus.TODO:
-                for dependency in task[1].dependencies:
-                    if self.tasks[dependency].status != TaskStatus.DONE:
-                        self.tasks[task[0]].status = TaskStatus.BLOCKED
-                        status_changed += 1
-            if task[1].status == TaskStatus.BLOCKED:
-                dependencies_done = True
-                for dependency in task[1].dependencies:
-                    if self.tasks[dependency].status != TaskStatus.DONE:
-                        dependencies_done = False
-                        break
-                if dependencies_done:
-                    self.tasks[task[0]].status = TaskStatus.TODO
-                    status_changed += 1
-        return status_changed
+        # Only tasks whose dependency counts or status moved since the last call can change
+        pending = list(self._status_pending)
+        for task_id in pending:
+            task = self.tasks[task_id]
+            self._set_status(task, TaskStatus.BLOCKED if task.status == TaskStatus.TODO else TaskStatus.TODO)
+        return len(pending)
+
+    def _overdue_ids(self) -> list[int]:
+        # Earliest due date first is most overdue first; ties stay in creation order
+        return [task_id for _, task_id in self._by_due.irange(maximum=(self.clock(),), inclusive=(True, False))]
 
-    def get_overdue_tasks(self) -> list[Task]:
-        task_and_amount_overdue = []
-        for task in self.tasks.values():
-            if task.due_date < date.today() and task.status != TaskStatus.DONE:
-                amount_overdue = date.today() - task.due_date
-                task_and_amount_overdue.append((task, amount_overdue))
-        task_and_amount_overdue = sorted(task_and_amount_overdue, key= lambda task: (task[1], task[0].id))
-        sorted_overdue_tasks = []
-        for task in task_and_amount_overdue:
-            sorted_overdue_tasks.append(task[0])
-        return sorted_overdue_tasks
+    def get_overdue_tasks(self, copy: bool = False) -> list[TaskView]:
+        return self._results(self._overdue_ids(), copy)
 
     def update_overdue_status(self) -> int:
-        overdue_tasks = self.get_overdue_tasks()
         status_changed = 0
-        for task in overdue_tasks:
-            self.tasks[task.id].status = TaskStatus.OVERDUE
-            status_changed += 1
+        for task_id in self._overdue_ids():
+            task = self.tasks[task_id]
+            if task.status != TaskStatus.OVERDUE:
+                self._set_status(task, TaskStatus.OVERDUE)
+                status_changed += 1
         return status_changed
 
     ###
@@ -188,29 +555,97 @@ class TaskManager:
     def create_task_with_priority(self, title: str, description: str, priority: str) -> int:
         if not title:
             raise ValueError("Title cannot be empty.")
-        id = len(self.tasks) + 1
-        self.tasks[id] = Task(title=title, description=description, id=id, status=TaskStatus.TODO, priority=priority)
+        id = self._next_id
+        self._insert_task(
+            Task(
+                title=title,
+                description=description,
+                id=id,
+                status=TaskStatus.TODO,
+                priority=priority,
+                created_date=self.clock(),
+            )
+        )
         return id
 
     def update_task_priority(self, task_id: int, priority: str) -> bool:
         if not task_id in self.tasks:
             return False
         self.tasks[task_id].priority = priority
+        self._reindex(self.tasks[task_id])
         return True
+
+    def get_tasks_by_priority(self, priority: str, copy: bool = False) -> list[TaskView]:
+        return self._results(self._by_priority.get(priority, ()), copy)
         
     ###
     # TASK DEPENDENCY MANAGEMENT
     ###
 
-    def _circular(self):
-        topological_sorter = TopologicalSorter()
-        for idx, task in self.tasks.items():
-            topological_sorter.add(idx, *(dep for dep in task.dependencies if dep in self.tasks))
-        try:
-            _ = list(topological_sorter.static_order())
-            return False
-        except CycleError as e:
-            return True
+    def _link(self, task_id: int, prev_id: int | None, next_id: int | None) -> None:
+        self._order_prev[task_id] = prev_id
+        self._order_next[task_id] = next_id
+        self._order_next[prev_id] = task_id
+        self._order_prev[next_id] = task_id
+
+    def _unlink(self, task_id: int) -> None:
+        prev_id = self._order_prev.pop(task_id)
+        next_id = self._order_next.pop(task_id)
+        self._order_next[prev_id] = next_id
+        self._order_prev[next_id] = prev_id
+
+    def _move(self, ids: list[int], anchor: int, after: bool) -> None:
+        # Splice ids, in order, into the order right after or right before anchor, then label them
+        for task_id in ids:
+            self._unlink(task_id)
+        prev_id = anchor if after else self._order_prev[anchor]
+        for task_id in ids:
+            self._link(task_id, prev_id, self._order_next[prev_id])
+            prev_id = task_id
+        self._relabel(ids[0], ids[-1], len(ids))
+
+    def _relabel(self, first: int, last: int, count: int) -> None:
+        # Spread labels evenly over the run first..last of `count` tasks, strictly between its
+        # neighbours' labels; while the gap is too tight the run takes in neighbours on both
+        # sides, doubling each time, so a crowded stretch is spaced out once, not every move
+        while True:
+            before, after = self._order_prev[first], self._order_next[last]
+            if before is None or after is None:
+                spacing = _ORDER_GAP
+                if before is not None:
+                    start = self._position[before]
+                elif after is not None:
+                    start = self._position[after] - (count + 1) * spacing
+                else:
+                    start = 0
+                break
+            start = self._position[before]
+            spacing = (self._position[after] - start) // (count + 1)
+            if spacing >= count:
+                break
+            for _ in range(count):
+                if before is not None:
+                    first, before = before, self._order_prev[before]
+                    count += 1
+                if after is not None:
+                    last, after = after, self._order_next[after]
+                    count += 1
+        task_id = first
+        for offset in range(1, count + 1):
+            self._position[task_id] = start + offset * spacing
+            task_id = self._order_next[task_id]
+
+    def _search(self, start_id: int, neighbours, within) -> Iterator[int]:
+        # Tasks reachable from start_id through `neighbours` whose label passes `within`, one at a time
+        yield start_id
+        seen = {start_id}
+        stack = [start_id]
+        while stack:
+            for neighbour in neighbours(stack.pop()):
+                if neighbour not in seen and within(self._position[neighbour]):
+                    seen.add(neighbour)
+                    stack.append(neighbour)
+                    yield neighbour
 
     def add_dependency(self, task_id: int, depends_on_task_id: int) -> bool:
         if not task_id in self.tasks or not depends_on_task_id in self.tasks:
@@ -219,13 +654,49 @@ class TaskManager:
             return False
         if self.tasks[task_id].status == TaskStatus.DONE:
             return False
-        old_tasks = deepcopy(self.tasks)
+        if task_id in self._dependents[depends_on_task_id]:
+            return True
+        lower = self._position[task_id]
+        upper = self._position[depends_on_task_id]
+        if upper > lower:
+            # The edge contradicts the current order, so only tasks labelled between the two
+            # endpoints can lie on a cycle or need to move (Pearce-Kelly). Either side alone
+            # settles it: task_id's dependents in range can all move to just after the new
+            # dependency, or the new dependency's own dependencies in range to just before
+            # task_id. Search both sides in step and use whichever runs out first, so the
+            # work is bounded by the smaller side.
+            forward_search = self._search(task_id, self._dependents.__getitem__, lambda label: label <= upper)
+            backward_search = self._search(
+                depends_on_task_id, lambda id: self.tasks[id].dependencies, lambda label: label >= lower
+            )
+            forward, backward = [], []
+            while True:
+                found = next(forward_search, None)
+                if found is None:
+                    if depends_on_task_id in forward:
+                        return False
+                    self._move(sorted(forward, key=self._position.__getitem__), depends_on_task_id, after=True)
+                    break
+                forward.append(found)
+                found = next(backward_search, None)
+                if found is None:
+                    if task_id in backward:
+                        return False
+                    self._move(sorted(backward, key=self._position.__getitem__), task_id, after=False)
+                    break
+                backward.append(found)
         self.tasks[task_id].dependencies.append(depends_on_task_id)
-        if self._circular():
-            self.tasks = deepcopy(old_tasks)
-            return False
+        self._dependents[depends_on_task_id].add(task_id)
+        if self.tasks[depends_on_task_id].status != TaskStatus.DONE:
+            self._unfinished[task_id] += 1
+            self._track_readiness(self.tasks[task_id])
         return True
 
+    def get_dependents(self, task_id: int) -> list[int]:
+        if not task_id in self.tasks:
+            return []
+        return sorted(self._dependents[task_id])
+
     def remove_dependency(self, task_id: str, depends_on_task_id: str) -> bool:
         if not task_id in self.tasks:
             return False
@@ -234,6 +705,10 @@ class TaskManager:
         if not depends_on_task_id in self.tasks[task_id].dependencies:
             return False
         self.tasks[task_id].dependencies.remove(depends_on_task_id)
+        self._dependents[depends_on_task_id].discard(task_id)
+        if self.tasks[depends_on_task_id].status != TaskStatus.DONE:
+            self._unfinished[task_id] -= 1
+            self._track_readiness(self.tasks[task_id])
         return True
 
     ###
@@ -244,13 +719,13 @@ class TaskManager:
         if not task_id in self.tasks:
             return False
         self.tasks[task_id].due_date = due_date
+        self._track_indexes(self.tasks[task_id])
         return True
     
-    def get_tasks_due_soon(self, days: int) -> list[Task]:
-        due_soon = []
-        for task in self.tasks.values():
-            time_diff = date.today() - task.due_date
-            if time_diff <= 
+    def get_tasks_due_soon(self, days: int, copy: bool = False) -> list[TaskView]:
+        today = self.clock()
+        window = self._by_due.irange((today,), (today + timedelta(days=days + 1),), inclusive=(True, False))
+        return self._results([task_id for _, task_id in window], copy)
 
     ###
     # USER MANAGEMENT
@@ -260,7 +735,7 @@ class TaskManager:
         if not name or not email:
             raise ValueError("Name and email must be populated.")
         id = len(self.users) + 1
-        self.users[id] = User(name=name, email=name, id=id)
+        self.users[id] = User(name=name, email=email, id=id)
         return id
 
     def get_user(self, user_id: int) -> User | None:
@@ -268,12 +743,258 @@ class TaskManager:
             return None
         return self.users[user_id]
 
-    def get_user_tasks(self, user_id: int) -> list[Task]:
-        user_tasks = []
-        for task in self.tasks.values():
-            if task.assignee_id == user_id:
-                user_tasks.append(task)
-        user_tasks = sorted(user_tasks, key= lambda task: (task.due_date is None, task.due_date, task.priority, task.id))
-        return user_tasks
+    def get_user_tasks(self, user_id: int, copy: bool = False) -> list[TaskView]:
+        return self._results([key[-1] for key in self._by_assignee.get(user_id, ())], copy)
+
+    def bulk_assign_tasks(self, task_ids: list[int], user_id: int) -> int:
+        assigned = 0
+        for task_id in task_ids:
+            if self.assign_task(task_id, user_id):
+                assigned += 1
+        return assigned
+
+    def get_task_summary_by_user(self) -> dict[int, dict[str, int]]:
+        summary = {}
+        for user_id in self.users:
+            counts = self._user_status_counts.get(user_id, {})
+            summary[user_id] = {status.value: count for status, count in counts.items() if count}
+        return summary
+
+    ###
+    # PROJECTS AND TEMPLATES
+    ###
+
+    def create_project(self, name: str, description: str, owner_id: int) -> int:
+        if not name:
+            raise ValueError("Project name cannot be empty.")
+        id = len(self.projects) + 1
+        self.projects[id] = Project(
+            name=name, description=description, owner_id=owner_id, id=id, created_date=self.clock()
+        )
+        return id
+
+    def get_project(self, project_id: int) -> Project | None:
+        if not project_id in self.projects:
+            return None
+        return self.projects[project_id]
+
+    def assign_task_to_project(self, task_id: int, project_id: int) -> bool:
+        if not task_id in self.tasks or not project_id in self.projects:
+            return False
+        self.tasks[task_id].project_id = project_id
+        self._track_indexes(self.tasks[task_id])
+        return True
+
+    def get_project_tasks(self, project_id: int, copy: bool = False) -> list[TaskView]:
+        # Keys are (priority, undated, due date, id), so the index is already in display order
+        return self._results([key[-1] for key in self._by_project.get(project_id, ())], copy)
+
+    def get_project_progress(self, project_id: int) -> dict[str, int | float]:
+        counts = self._project_status_counts.get(project_id, {})
+        total = sum(counts.values())
+        done = counts.get(TaskStatus.DONE, 0)
+        return {"total": total, "done": done, "percent_complete": done / total * 100 if total else 0.0}
+
+    def create_task_template(
+        self,
+        name: str,
+        title_template: str,
+        description_template: str,
+        default_priority: TaskPriority,
+        estimated_hours: float | None = None,
+    ) -> int:
+        id = len(self.templates) + 1
+        self.templates[id] = TaskTemplate(
+            name=name,
+            title_template=title_template,
+            description_template=description_template,
+            default_priority=default_priority,
+            id=id,
+            estimated_hours=estimated_hours,
+        )
+        return id
+
+    def create_task_from_template(self, template_id: int, project_id: int | None = None) -> int:
+        if not template_id in self.templates:
+            raise ValueError(f"Unknown template {template_id}.")
+        if project_id is not None and not project_id in self.projects:
+            raise ValueError(f"Unknown project {project_id}.")
+        template = self.templates[template_id]
+        title, description = template.title_template, template.description_template
+        if project_id is not None:
+            project_name = self.projects[project_id].name
+            title = title.replace("{project_name}", project_name)
+            description = description.replace("{project_name}", project_name)
+        task_id = self.create_task_with_priority(title, description, template.default_priority)
+        self.tasks[task_id].estimated_hours = template.estimated_hours
+        if project_id is not None:
+            self.assign_task_to_project(task_id, project_id)
+        return task_id
 
-    
\ No newline at end of file
+    ###
+    # SEARCH
+    ###
+
+    def _index_text(self, task: Task) -> None:
+        title = task.title.lower()
+        description = (task.description or "").lower()
+        self._search_text[task.id] = (title, description)
+        _post(self._exact_titles, title, task.id)
+        for gram in _grams(title):
+            _post(self._title_grams, gram, task.id)
+        for gram in _grams(description):
+            _post(self._description_grams, gram, task.id)
+
+    def _unindex_text(self, task_id: int) -> None:
+        title, description = self._search_text.pop(task_id)
+        _unpost(self._exact_titles, title, task_id)
+        for gram in _grams(title):
+            _unpost(self._title_grams, gram, task_id)
+        for gram in _grams(description):
+            _unpost(self._description_grams, gram, task_id)
+
+    def update_task(self, task_id: int, title: str | None = None, description: str | None = None) -> bool:
+        if not task_id in self.tasks:
+            return False
+        if title is not None and not title:
+            raise ValueError("Title cannot be empty.")
+        task = self.tasks[task_id]
+        self._unindex_text(task_id)
+        if title is not None:
+            task.title = title
+        if description is not None:
+            task.description = description
+        self._index_text(task)
+        return True
+
+    def _candidates(self, grams: dict, needle: str):
+        # Ids, in creation order, that may contain needle: the postings of its rarest trigram
+        if len(needle) < 3:
+            return self.tasks
+        postings = []
+        for gram in _grams(needle):
+            ids = grams.get(gram)
+            if ids is None:
+                return ()
+            postings.append(ids)
+        return min(postings, key=len)
+
+    def _ranked_matches(self, needle: str) -> Iterator[int]:
+        # Exact title matches, then title substrings, then description substrings; each in creation order
+        yield from self._exact_titles.get(needle, ())
+        for task_id in self._candidates(self._title_grams, needle):
+            title, _ = self._search_text[task_id]
+            if needle in title and title != needle:
+                yield task_id
+        for task_id in self._candidates(self._description_grams, needle):
+            title, description = self._search_text[task_id]
+            if needle in description and needle not in title:
+                yield task_id
+
+    def search_tasks(
+        self,
+        query: str,
+        project_id: int | None = None,
+        assignee_id: int | None = None,
+        status: TaskStatus | None = None,
+        limit: int | None = None,
+        copy: bool = False,
+    ) -> list[TaskView]:
+        matches = self._ranked_matches(query.lower())
+        if project_id is not None or assignee_id is not None or status is not None:
+            tasks = self.tasks
+            matches = (
+                task_id
+                for task_id in matches
+                if (project_id is None or tasks[task_id].project_id == project_id)
+                and (assignee_id is None or tasks[task_id].assignee_id == assignee_id)
+                and (status is None or tasks[task_id].status == status)
+            )
+        # The tiers are generated lazily, so a limit stops the search as soon as it is met
+        return self._results(list(islice(matches, limit)), copy)
+
+    ###
+    # TAGS
+    ###
+
+    def add_task_tags(self, task_id: int, tags: list[str]) -> bool:
+        if not task_id in self.tasks:
+            return False
+        task = self.tasks[task_id]
+        for tag in tags:
+            if tag not in task.tags:
+                task.tags.add(tag)
+                self._by_tag[tag].add(task_id)
+        return True
+
+    def remove_task_tags(self, task_id: int, tags: list[str]) -> bool:
+        if not task_id in self.tasks:
+            return False
+        task = self.tasks[task_id]
+        for tag in tags:
+            if tag in task.tags:
+                task.tags.discard(tag)
+                self._by_tag[tag].discard(task_id)
+        return True
+
+    def get_tasks_by_tags(self, tags: list[str], match_all: bool = True, copy: bool = False) -> list[TaskView]:
+        tags = set(tags)
+        if not tags:
+            # Every task has all of no tags and none has any of them
+            return self.get_all_tasks(copy) if match_all else []
+        arrays = [self._by_tag[tag].array() if tag in self._by_tag else None for tag in tags]
+        if match_all:
+            if any(ids is None for ids in arrays):
+                return []
+            # Intersect from the rarest tag so every step works on the smallest array
+            arrays.sort(key=len)
+            matched = arrays[0]
+            for ids in arrays[1:]:
+                matched = np.intersect1d(matched, ids, assume_unique=True)
+        else:
+            arrays = [ids for ids in arrays if ids is not None]
+            if not arrays:
+                return []
+            matched = np.unique(np.concatenate(arrays))
+        # Ids grow with creation time, so sorted ids are already in creation order
+        return self._results(matched.tolist(), copy)
+
+    ###
+    # TIME TRACKING
+    ###
+
+    def log_time(self, task_id: int, user_id: int, hours: float, description: str, log_date: date | None = None) -> bool:
+        if not task_id in self.tasks or not user_id in self.users:
+            return False
+        self._time_entries.append(task_id, user_id, log_date or self.clock(), hours, description)
+        self._task_hours[task_id] += hours
+        return True
+
+    def get_task_time_entries(self, task_id: int) -> list[TimeEntry]:
+        if not task_id in self.tasks:
+            return []
+        entries = self._time_entries
+        return entries.entries(entries.task_ids[:entries.size] == task_id)
+
+    def get_user_time_entries(
+        self, user_id: int, start_date: date | None = None, end_date: date | None = None
+    ) -> list[TimeEntry]:
+        entries = self._time_entries
+        return entries.entries((entries.user_ids[:entries.size] == user_id) & entries.window(start_date, end_date))
+
+    def get_total_time_spent(self, task_id: int) -> float:
+        return float(self._task_hours.get(task_id, 0.0))
+
+    def get_productivity_report(self, user_id: int, days: int) -> dict[str, int | float]:
+        # The window is the last `days` calendar days, today included: days=7 covers today
+        # and the six days before it
+        today = self.clock()
+        start = today - timedelta(days=days - 1)
+        entries = self._time_entries
+        mask = (entries.user_ids[:entries.size] == user_id) & entries.window(start, today)
+        completed = 0
+        for key in self._by_assignee.get(user_id, ()):
+            completed_on = self._completed_on.get(key[-1])
+            if completed_on is not None and start <= completed_on <= today:
+                completed += 1
+        return {"tasks_completed": completed, "hours_logged": float(entries.hours[:entries.size][mask].sum())}
@@ -1,5 +1,7 @@
+import copy
+import pickle
 import unittest
-from simulation import TaskManager, TaskStatus
+from simulation import Task, TaskManager, TaskStatus
 
 
 class TestLevel1TaskManager(unittest.TestCase):
@@ -77,6 +79,39 @@ class TestLevel1TaskManager(unittest.TestCase):
         non_existent = self.manager.get_task(999)
         self.assertIsNone(non_existent)
 
+    def test_query_results_are_read_only_views(self):
+        task_id = self.manager.create_task("Buy groceries", "Milk, eggs, bread")
+        view = self.manager.get_all_tasks()[0]
+        with self.assertRaises(AttributeError):
+            view.status = TaskStatus.DONE
+        with self.assertRaises(AttributeError):
+            view.dependencies.append(2)
+        # Views read through to the stored task
+        self.manager.update_task_status(task_id, TaskStatus.IN_PROGRESS)
+        self.assertEqual(view.status, TaskStatus.IN_PROGRESS)
+        self.assertEqual(self.manager.get_tasks_by_status(TaskStatus.IN_PROGRESS), [view])
+
+    def test_query_results_can_be_copied(self):
+        task_id = self.manager.create_task("Walk dog", "")
+        owned = self.manager.get_tasks_by_status(TaskStatus.TODO, copy=True)[0]
+        self.assertIsInstance(owned, Task)
+        owned.status = TaskStatus.DONE
+        self.assertEqual(self.manager.get_task(task_id).status, TaskStatus.TODO)
+        self.assertIsInstance(self.manager.get_task(task_id).copy(), Task)
+
+    def test_views_survive_copy_and_pickle(self):
+        task_id = self.manager.create_task("Walk dog", "")
+        view = self.manager.get_task(task_id)
+        self.assertIs(copy.copy(view), view)
+        owned = copy.deepcopy(self.manager.get_all_tasks())[0]
+        self.assertIsInstance(owned, Task)
+        owned.title = "Changed"
+        self.assertEqual(view.title, "Walk dog")
+        restored = pickle.loads(pickle.dumps(view))
+        self.assertEqual(restored, view)
+        with self.assertRaises(AttributeError):
+            restored.title = "Changed"
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,3 +1,4 @@
+import random
 import unittest
 from simulation import TaskManager, TaskStatus, TaskPriority
 
@@ -41,6 +42,58 @@ class TestLevel2TaskManager(unittest.TestCase):
         self.assertTrue(self.m.add_dependency(t2, t1))
         self.assertFalse(self.m.add_dependency(t1, t2))
 
+    def test_prevent_indirect_circular_dependency(self):
+        t1 = self.m.create_task("A", "")
+        t2 = self.m.create_task("B", "")
+        t3 = self.m.create_task("C", "")
+        self.assertTrue(self.m.add_dependency(t2, t1))
+        self.assertTrue(self.m.add_dependency(t3, t2))
+        self.assertFalse(self.m.add_dependency(t1, t3))
+        self.assertEqual(self.m.get_task(t1).dependencies, ())
+        # Diamonds are not cycles
+        self.assertTrue(self.m.add_dependency(t3, t1))
+
+    def test_dependencies_against_creation_order(self):
+        a = self.m.create_task("A", "")
+        b = self.m.create_task("B", "")
+        c = self.m.create_task("C", "")
+        # Older tasks depending on newer ones
+        self.assertTrue(self.m.add_dependency(a, c))
+        self.assertTrue(self.m.add_dependency(b, a))
+        self.assertFalse(self.m.add_dependency(c, a))
+        self.assertFalse(self.m.add_dependency(c, b))
+        self.assertTrue(self.m.remove_dependency(a, c))
+        self.assertTrue(self.m.add_dependency(c, b))
+        self.assertFalse(self.m.add_dependency(a, c))
+
+    def test_reverse_chain_then_cycle(self):
+        ids = [self.m.create_task(f"T{i}", "") for i in range(50)]
+        for task_id, depends_on in zip(ids, ids[1:]):
+            self.assertTrue(self.m.add_dependency(task_id, depends_on))
+        self.assertFalse(self.m.add_dependency(ids[-1], ids[0]))
+        self.assertTrue(self.m.add_dependency(ids[0], ids[-1]))
+
+    def test_cycles_match_reachability_on_random_edges(self):
+        rng = random.Random(7)
+        ids = [self.m.create_task(f"T{i}", "") for i in range(40)]
+
+        def reaches(start, target):
+            stack, seen = [start], {start}
+            while stack:
+                for dependent in self.m.get_dependents(stack.pop()):
+                    if dependent == target:
+                        return True
+                    if dependent not in seen:
+                        seen.add(dependent)
+                        stack.append(dependent)
+            return False
+
+        for _ in range(300):
+            task_id, depends_on = rng.sample(ids, 2)
+            # task_id -> depends_on closes a cycle iff depends_on already depends on task_id
+            expected = not reaches(task_id, depends_on)
+            self.assertEqual(self.m.add_dependency(task_id, depends_on), expected)
+
     def test_add_dependency_missing_task(self):
         t1 = self.m.create_task("A", "")
         self.assertFalse(self.m.add_dependency(999, t1))
@@ -100,6 +153,53 @@ class TestLevel2TaskManager(unittest.TestCase):
         self.m.delete_task(x)
         self.assertNotIn(x, self.m.get_task(y).dependencies)
 
+    def test_get_dependents(self):
+        a = self.m.create_task("A", "")
+        b = self.m.create_task("B", "")
+        c = self.m.create_task("C", "")
+        self.m.add_dependency(c, a)
+        self.m.add_dependency(b, a)
+        self.assertEqual(self.m.get_dependents(a), [b, c])
+        self.assertEqual(self.m.get_dependents(b), [])
+        self.assertEqual(self.m.get_dependents(999), [])
+        self.m.remove_dependency(c, a)
+        self.assertEqual(self.m.get_dependents(a), [b])
+
+    def test_delete_task_with_unrelated_dependencies(self):
+        a = self.m.create_task("A", "")
+        b = self.m.create_task("B", "")
+        c = self.m.create_task("C", "")
+        self.m.add_dependency(c, b)
+        self.m.add_dependency(b, a)
+        self.assertTrue(self.m.delete_task(a))
+        self.assertEqual(self.m.get_task(b).dependencies, ())
+        self.assertEqual(self.m.get_task(c).dependencies, (b,))
+        self.assertTrue(self.m.delete_task(c))
+        self.assertEqual(self.m.get_dependents(b), [])
+        # Ids are never reused after deletions
+        self.assertEqual(self.m.create_task("D", ""), c + 1)
+
+    def test_readiness_follows_dependency_status(self):
+        a = self.m.create_task("A", "")
+        b = self.m.create_task_with_priority("B", "", TaskPriority.HIGH)
+        c = self.m.create_task("C", "")
+        self.m.add_dependency(c, a)
+        self.m.add_dependency(c, b)
+        self.m.update_task_status(a, TaskStatus.DONE)
+        self.assertEqual([t.id for t in self.m.get_blocked_tasks()], [c])
+        self.m.update_task_status(b, TaskStatus.DONE)
+        self.assertEqual([t.id for t in self.m.get_available_tasks()], [c])
+        # Reopening a dependency blocks its dependents again
+        self.m.update_task_status(a, TaskStatus.IN_PROGRESS)
+        self.assertEqual([t.id for t in self.m.get_blocked_tasks()], [c])
+        self.m.delete_task(a)
+        self.assertEqual([t.id for t in self.m.get_available_tasks()], [c])
+        self.m.update_task_status(b, TaskStatus.TODO)
+        self.m.update_task_priority(c, TaskPriority.URGENT)
+        self.assertEqual(self.m.auto_update_blocked_status(), 1)
+        self.assertEqual([t.id for t in self.m.get_available_tasks()], [b])
+        self.assertEqual(self.m.auto_update_blocked_status(), 0)
+
     def test_complex_chain_availability(self):
         t4 = self.m.create_task("T4", "")
         t5 = self.m.create_task_with_priority("T5", "", TaskPriority.LOW)
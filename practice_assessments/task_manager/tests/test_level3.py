@@ -83,6 +83,58 @@ class TestLevel3TaskManager(unittest.TestCase):
         # Counts may vary by status, but u2 should be present with empty or zeroed dict
         self.assertIn(u2, summary)
 
+    def test_user_tasks_follow_field_changes(self):
+        uid = self.m.create_user("U", "u@e.com")
+        t1 = self.m.create_task("T1", "")
+        t2 = self.m.create_task("T2", "")
+        t3 = self.m.create_task("T3", "")
+        self.m.bulk_assign_tasks([t1, t2, t3, 999], uid)
+        self.m.set_due_date(t3, date.today())
+        self.assertEqual([t.id for t in self.m.get_user_tasks(uid)], [t3, t1, t2])
+        self.m.update_task_priority(t2, TaskPriority.URGENT)
+        self.m.set_due_date(t3, None)
+        self.assertEqual([t.id for t in self.m.get_user_tasks(uid)], [t2, t1, t3])
+        self.m.unassign_task(t2)
+        self.m.delete_task(t1)
+        self.assertEqual([t.id for t in self.m.get_user_tasks(uid)], [t3])
+        other = self.m.create_user("V", "v@e.com")
+        self.m.assign_task(t3, other)
+        self.assertEqual(self.m.get_user_tasks(uid), [])
+        self.assertEqual([t.id for t in self.m.get_user_tasks(other)], [t3])
+
+    def test_summary_counts_by_status(self):
+        u1 = self.m.create_user("A", "a@e.com")
+        u2 = self.m.create_user("B", "b@e.com")
+        ids = [self.m.create_task(f"T{i}", "") for i in range(3)]
+        self.m.bulk_assign_tasks(ids, u1)
+        self.m.update_task_status(ids[0], TaskStatus.DONE)
+        self.m.assign_task(ids[2], u2)
+        summary = self.m.get_task_summary_by_user()
+        self.assertEqual(summary[u1], {"DONE": 1, "TODO": 1})
+        self.assertEqual(summary[u2], {"TODO": 1})
+        self.assertEqual(self.m.get_user(u1).email, "a@e.com")
+
+    def test_due_queries_against_fixed_clock(self):
+        today = date(2024, 3, 1)
+        m = TaskManager(clock=lambda: today)
+        late = m.create_task("Late", "")
+        later = m.create_task("Later", "")
+        soon = m.create_task("Soon", "")
+        done = m.create_task("Done", "")
+        m.set_due_date(late, today - timedelta(days=1))
+        m.set_due_date(later, today - timedelta(days=10))
+        m.set_due_date(soon, today + timedelta(days=3))
+        m.set_due_date(done, today - timedelta(days=5))
+        m.update_task_status(done, TaskStatus.DONE)
+        # Most overdue first; DONE tasks are never overdue
+        self.assertEqual([t.id for t in m.get_overdue_tasks()], [later, late])
+        self.assertEqual(m.update_overdue_status(), 2)
+        self.assertEqual(m.update_overdue_status(), 0)
+        self.assertEqual([t.id for t in m.get_tasks_due_soon(3)], [soon])
+        self.assertEqual(m.get_tasks_due_soon(2), [])
+        today = date(2024, 3, 5)
+        self.assertEqual([t.id for t in m.get_overdue_tasks()], [later, late, soon])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 from datetime import date, timedelta
-from simulation import TaskManager, TaskStatus, TaskPriority
+from simulation import TaskManager, TaskStatus, TaskPriority, TimeEntry
 
 
 class TestLevel4TaskManager(unittest.TestCase):
@@ -34,6 +34,26 @@ class TestLevel4TaskManager(unittest.TestCase):
         # URGENT first regardless of due, then among remaining by due date
         self.assertEqual(ordered[0], t2)
 
+    def test_project_order_follows_priority_and_due_changes(self):
+        pid = self.m.create_project("P", "", self.owner)
+        other = self.m.create_project("Q", "", self.owner)
+        t1 = self.m.create_task("A", "")
+        t2 = self.m.create_task("B", "")
+        t3 = self.m.create_task("C", "")
+        for tid in (t1, t2, t3):
+            self.m.assign_task_to_project(tid, pid)
+        self.m.set_due_date(t3, date.today())
+        self.assertEqual([t.id for t in self.m.get_project_tasks(pid)], [t3, t1, t2])
+        self.m.update_task_priority(t2, TaskPriority.HIGH)
+        self.m.set_due_date(t3, None)
+        self.assertEqual([t.id for t in self.m.get_project_tasks(pid)], [t2, t1, t3])
+        self.m.assign_task_to_project(t1, other)
+        self.m.update_task_status(t2, TaskStatus.DONE)
+        self.assertEqual([t.id for t in self.m.get_project_tasks(pid)], [t2, t3])
+        self.assertEqual(self.m.get_project_progress(pid), {"total": 2, "done": 1, "percent_complete": 50.0})
+        self.assertEqual(self.m.get_project_progress(999), {"total": 0, "done": 0, "percent_complete": 0.0})
+        self.assertFalse(self.m.assign_task_to_project(t1, 999))
+
     def test_templates_creation_and_instantiation(self):
         pid = self.m.create_project("Alpha", "", self.owner)
         tpl = self.m.create_task_template(
@@ -62,6 +82,43 @@ class TestLevel4TaskManager(unittest.TestCase):
         results = [t.id for t in self.m.search_tasks("Refactor")]
         self.assertEqual(results[0], t1)
 
+    def test_search_tiers_filters_and_limit(self):
+        a = self.m.create_task("Deploy API", "")
+        b = self.m.create_task("API", "Public endpoints")
+        c = self.m.create_task("Docs", "Describe the api")
+        d = self.m.create_task("Rapid fix", "")
+        self.assertEqual([t.id for t in self.m.search_tasks("api")], [b, a, d, c])
+        self.assertEqual([t.id for t in self.m.search_tasks("API", limit=2)], [b, a])
+        self.m.assign_task(c, self.member)
+        self.assertEqual([t.id for t in self.m.search_tasks("api", assignee_id=self.member)], [c])
+        self.m.update_task(d, title="Quick fix", description="endpoints")
+        self.m.delete_task(b)
+        self.assertEqual([t.id for t in self.m.search_tasks("api")], [a, c])
+        self.assertEqual([t.id for t in self.m.search_tasks("endpoints")], [d])
+
+    def test_search_after_deletes_on_a_large_board(self):
+        # Enough tasks sharing title grams that their postings outgrow plain lists
+        ids = [self.m.create_task(f"Sprint task {i}", "") for i in range(200)]
+        for task_id in ids[::2]:
+            self.m.delete_task(task_id)
+        self.m.update_task(ids[1], title="Renamed")
+        self.assertEqual([t.id for t in self.m.search_tasks("sprint")], ids[3::2])
+        self.assertEqual(self.m.search_tasks("missing"), [])
+
+    def test_tag_index_follows_removals_and_deletes(self):
+        t1 = self.m.create_task("A", "")
+        t2 = self.m.create_task("B", "")
+        t3 = self.m.create_task("C", "")
+        for tid in (t3, t1, t2):
+            self.m.add_task_tags(tid, ["ops", "infra"])
+        self.assertEqual([t.id for t in self.m.get_tasks_by_tags(["ops", "infra"])], [t1, t2, t3])
+        self.m.remove_task_tags(t2, ["ops"])
+        self.m.delete_task(t3)
+        self.assertEqual([t.id for t in self.m.get_tasks_by_tags(["ops", "infra"])], [t1])
+        self.assertEqual([t.id for t in self.m.get_tasks_by_tags(["ops", "infra"], match_all=False)], [t1, t2])
+        self.assertEqual(self.m.get_tasks_by_tags(["ops", "unknown"]), [])
+        self.assertFalse(self.m.add_task_tags(999, ["ops"]))
+
     def test_time_logging_and_reports(self):
         tid = self.m.create_task("Implement", "")
         self.m.assign_task(tid, self.member)
@@ -79,6 +136,53 @@ class TestLevel4TaskManager(unittest.TestCase):
         self.assertIn("tasks_completed", report)
         self.assertIn("hours_logged", report)
 
+    def test_time_entries_windows_and_reports(self):
+        today = date(2024, 6, 30)
+        m = TaskManager(clock=lambda: today)
+        uid = m.create_user("Dev", "dev@org.com")
+        other = m.create_user("Ops", "ops@org.com")
+        a = m.create_task("A", "")
+        b = m.create_task("B", "")
+        m.assign_task(a, uid)
+        # Enough entries to grow the columns past their initial capacity
+        for day in range(1, 1201):
+            m.log_time(b, other, 0.5, f"day {day}", log_date=date(2021, 1, 1) + timedelta(days=day))
+        m.log_time(a, uid, 1.5, "first", log_date=today - timedelta(days=3))
+        m.log_time(a, uid, 2.0, "second")
+        m.log_time(a, uid, 0.5, "third", log_date=today - timedelta(days=3))
+        m.log_time(a, uid, 4.0, "old", log_date=today - timedelta(days=30))
+        self.assertFalse(m.log_time(a, 999, 1.0, "nobody"))
+        entries = m.get_task_time_entries(a)
+        self.assertEqual([e.description for e in entries], ["second", "first", "third", "old"])
+        self.assertEqual(entries[0], TimeEntry(a, uid, 2.0, today, "second"))
+        self.assertAlmostEqual(m.get_total_time_spent(a), 8.0)
+        self.assertAlmostEqual(m.get_total_time_spent(b), 600.0)
+        self.assertEqual(m.get_total_time_spent(999), 0.0)
+        window = m.get_user_time_entries(uid, start_date=today - timedelta(days=5), end_date=today - timedelta(days=1))
+        self.assertEqual([e.description for e in window], ["first", "third"])
+        self.assertEqual(len(m.get_user_time_entries(other)), 1200)
+        m.update_task_status(a, TaskStatus.DONE)
+        self.assertEqual(m.get_productivity_report(uid, 7), {"tasks_completed": 1, "hours_logged": 4.0})
+        today = date(2024, 8, 1)
+        self.assertEqual(m.get_productivity_report(uid, 7), {"tasks_completed": 0, "hours_logged": 0.0})
+
+    def test_productivity_report_covers_exactly_days(self):
+        today = date(2024, 6, 30)
+        m = TaskManager(clock=lambda: today)
+        uid = m.create_user("Dev", "dev@org.com")
+        a = m.create_task("A", "")
+        m.assign_task(a, uid)
+        m.log_time(a, uid, 1.0, "edge", log_date=today - timedelta(days=6))
+        m.log_time(a, uid, 2.0, "outside", log_date=today - timedelta(days=7))
+        # Completed exactly 7 days before the report
+        m.update_task_status(a, TaskStatus.DONE)
+        today += timedelta(days=7)
+        self.assertEqual(m.get_productivity_report(uid, 7), {"tasks_completed": 0, "hours_logged": 0.0})
+        self.assertEqual(m.get_productivity_report(uid, 8), {"tasks_completed": 1, "hours_logged": 0.0})
+        today -= timedelta(days=7)
+        self.assertEqual(m.get_productivity_report(uid, 7), {"tasks_completed": 1, "hours_logged": 1.0})
+        self.assertEqual(m.get_productivity_report(uid, 8), {"tasks_completed": 1, "hours_logged": 3.0})
+
     def test_bulk_update_task_status(self):
         ids = [self.m.create_task(f"T{i}", "") for i in range(5)]
         updated = self.m.bulk_update_task_status(ids, TaskStatus.IN_PROGRESS)